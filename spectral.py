@@ -6,28 +6,91 @@
 ╚═══════════════════════════════════════════════════════════════════════════════╝
 """
 
-import curses
+import codecs
 import os
 import sys
 import time
-import getpass
-import socket
-import subprocess
+import zlib
 import shutil
-import platform
-import pty
+import stat
 import select
 import threading
 import json
-import random
-from collections import deque
+import queue
+import re
+import signal
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
 from datetime import datetime
+from types import MappingProxyType
 
+
+class LazyModule:
+    """A module imported on first attribute access, which then replaces this
+    stand-in as the global, so --once/--stream never load the TUI's modules.
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        module = __import__(self._name)
+        globals()[self._name] = module
+        return getattr(module, attr)
+
+
+curses = LazyModule("curses")
+random = LazyModule("random")
+socket = LazyModule("socket")
+subprocess = LazyModule("subprocess")
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STARTUP TIMING
+# ═══════════════════════════════════════════════════════════════════════════════
+class StartupTimer:
+    """Phase durations from interpreter start to the first painted frame."""
+
+    def __init__(self):
+        # Interpreter start-up and imports are CPU bound, so the CPU time used
+        # so far stands in for their wall time; later phases are wall clock
+        self.boot = time.process_time()
+        self.marks = [("start", time.perf_counter())]
+        self.painted = False
+
+    def mark(self, phase):
+        self.marks.append((phase, time.perf_counter()))
+        if phase == "first frame":
+            self.painted = True
+
+    def report(self):
+        rows = [("interpreter + imports", self.boot)]
+        for (_, start), (phase, end) in zip(self.marks, self.marks[1:]):
+            rows.append((phase, end - start))
+        rows.append(("total", sum(t for _, t in rows)))
+        return "\n".join(f"{phase:<24}{t * 1000:8.1f} ms" for phase, t in rows)
+
+
+STARTUP = StartupTimer()
 # ═══════════════════════════════════════════════════════════════════════════════
 # SYSTEM INFO
 # ═══════════════════════════════════════════════════════════════════════════════
-USER = getpass.getuser()
-HOST = socket.gethostname()
+def get_user():
+    """getpass.getuser() without importing getpass (and termios) for it."""
+    for name in ("LOGNAME", "USER", "LNAME", "USERNAME"):
+        if os.environ.get(name):
+            return os.environ[name]
+    try:
+        import pwd
+
+        return pwd.getpwuid(os.getuid()).pw_name
+    except:
+        return "operator"
+
+
+USER = get_user()
+HOST = os.uname().nodename if hasattr(os, "uname") else os.environ.get("COMPUTERNAME")
 PLATFORM = sys.platform.upper()
 IS_WINDOWS = sys.platform.startswith("win")
 IS_MAC = sys.platform.startswith("darwin")
@@ -35,6 +98,7 @@ IS_LINUX = sys.platform.startswith("linux")
 HOME = os.path.expanduser("~")
 START_TIME = time.time()
 CONFIG_FILE = os.path.join(HOME, ".spectral.json")
+HISTORY_FILE = os.path.join(HOME, ".spectral_history")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -51,20 +115,68 @@ def load_config():
 
 
 def save_config(theme_idx, path):
+    # Merge so hand-edited settings (e.g. "scrollback") survive a save
+    config = load_config()
+    config.update(theme=theme_idx, path=path)
     try:
         with open(CONFIG_FILE, "w") as f:
-            json.dump({"theme": theme_idx, "path": path}, f)
+            json.dump(config, f)
     except:
         pass
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN LOOP WAKEUP
+# ═══════════════════════════════════════════════════════════════════════════════
+class Waker:
+    """Self-pipe the UI loop blocks on, so worker threads can interrupt it.
+
+    Anything that changes what is on screen from outside the main thread
+    (collector ticks, job output, directory scans, search progress) calls
+    wake(); signals are routed here too via signal.set_wakeup_fd().
+    """
+
+    def __init__(self):
+        self.r = self.w = None
+        self.pending = False
+
+    def open(self):
+        """Create the pipe; until then (and on Windows) wake() does nothing."""
+        if self.r is None and not IS_WINDOWS:
+            self.r, self.w = os.pipe()
+            os.set_blocking(self.r, False)
+            os.set_blocking(self.w, False)
+
+    def fileno(self):
+        return self.r
+
+    def wake(self):
+        if self.w is None or self.pending:
+            return
+        self.pending = True
+        try:
+            os.write(self.w, b"\0")
+        except OSError:
+            pass  # Pipe full: a wakeup is already queued
+
+    def drain(self):
+        # Clear the flag first so a wake() racing with this is never lost
+        self.pending = False
+        try:
+            while os.read(self.r, 4096):
+                pass
+        except (OSError, TypeError):
+            pass
+
+
+WAKER = Waker()
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # EVENT LOGGING
 # ═══════════════════════════════════════════════════════════════════════════════
 class EventManager:
     def __init__(self):
         self.events = deque(maxlen=20)
-        self.add("System initialized.")
         self.flavor_messages = [
             "Encrypted connection established",
             "Scanning local subnet...",
@@ -77,19 +189,24 @@ class EventManager:
             "Buffer flushed",
             "Daemon restarted",
         ]
-        self.last_flavor = time.time()
+        self.next_flavor = float("inf")  # The ticker runs once the dashboard starts
+
+    def start(self):
+        self.add("System initialized.")
+        self.next_flavor = time.time() + random.randint(10, 30)
 
     def add(self, msg, type="INFO"):
         ts = datetime.now().strftime("%H:%M:%S")
         self.events.appendleft(f"[{ts}] {msg}")
+        WAKER.wake()
 
     def get_latest(self):
         return self.events[0] if self.events else ""
 
     def update(self):
         # Insert random flavor text every 10-30 seconds
-        if time.time() - self.last_flavor > random.randint(10, 30):
-            self.last_flavor = time.time()
+        if time.time() >= self.next_flavor:
+            self.next_flavor = time.time() + random.randint(10, 30)
             self.add(random.choice(self.flavor_messages), "FLAVOR")
 
 
@@ -100,39 +217,39 @@ EVENTS = EventManager()
 # ═══════════════════════════════════════════════════════════════════════════════
 THEMES = {
     "spectral": {
-        "primary": curses.COLOR_WHITE,
-        "secondary": curses.COLOR_CYAN,
-        "accent": curses.COLOR_WHITE,
+        "primary": "white",
+        "secondary": "cyan",
+        "accent": "white",
     },
     "mint": {
-        "primary": curses.COLOR_GREEN,
-        "secondary": curses.COLOR_WHITE,
-        "accent": curses.COLOR_CYAN,
+        "primary": "green",
+        "secondary": "white",
+        "accent": "cyan",
     },
     "lavender": {
-        "primary": curses.COLOR_MAGENTA,
-        "secondary": curses.COLOR_WHITE,
-        "accent": curses.COLOR_WHITE,
+        "primary": "magenta",
+        "secondary": "white",
+        "accent": "white",
     },
     "ocean": {
-        "primary": curses.COLOR_BLUE,
-        "secondary": curses.COLOR_WHITE,
-        "accent": curses.COLOR_CYAN,
+        "primary": "blue",
+        "secondary": "white",
+        "accent": "cyan",
     },
     "sunset": {
-        "primary": curses.COLOR_YELLOW,
-        "secondary": curses.COLOR_RED,
-        "accent": curses.COLOR_MAGENTA,
+        "primary": "yellow",
+        "secondary": "red",
+        "accent": "magenta",
     },
     "nord": {
-        "primary": curses.COLOR_CYAN,
-        "secondary": curses.COLOR_BLUE,
-        "accent": curses.COLOR_WHITE,
+        "primary": "cyan",
+        "secondary": "blue",
+        "accent": "white",
     },
     "mono": {
-        "primary": curses.COLOR_WHITE,
-        "secondary": curses.COLOR_WHITE,
-        "accent": curses.COLOR_WHITE,
+        "primary": "white",
+        "secondary": "white",
+        "accent": "white",
     },
 }
 THEME_NAMES = list(THEMES.keys())
@@ -176,12 +293,96 @@ def ping_host(host="8.8.8.8"):
     return "---"
 
 
+class CpuSampler:
+    """Interval CPU usage from /proc/stat, aggregate and per core.
+
+    The previous counters are kept between samples so usage reflects the load
+    since the last sample rather than the average since boot.
+    """
+
+    STATES = ("user", "system", "iowait", "irq", "steal")
+
+    def __init__(self):
+        self.prev = {}
+        self.last_time = 0
+        self.last = {"total": 0, "states": {}, "cores": [], "core_states": []}
+        self.lock = threading.Lock()
+        self.max_age = 0.5  # Callers within this window share one reading
+
+    def read_counters(self):
+        counters = {}
+        with open("/proc/stat", "rb") as f:
+            for line in f:
+                if not line.startswith(b"cpu"):
+                    break
+                parts = line.split()
+                counters[parts[0]] = [int(x) for x in parts[1:9]]
+        return counters
+
+    def usage(self, cur, prev):
+        delta = [c - p for c, p in zip(cur, prev)] if prev else cur
+        delta += [0] * (8 - len(delta))
+        total = sum(delta)
+        if total <= 0:
+            return 0, dict.fromkeys(self.STATES, 0)
+        # user nice system idle iowait irq softirq steal
+        states = {
+            "user": (delta[0] + delta[1]) * 100 / total,
+            "system": delta[2] * 100 / total,
+            "iowait": delta[4] * 100 / total,
+            "irq": (delta[5] + delta[6]) * 100 / total,
+            "steal": delta[7] * 100 / total,
+        }
+        busy = total - delta[3] - delta[4]  # iowait is idle, waiting on I/O (as in top)
+        return round(busy * 100 / total), states
+
+    def sample(self, max_age=None):
+        """Parse /proc/stat once and return aggregate and per-core usage."""
+        if max_age is None:
+            max_age = self.max_age
+        with self.lock:
+            now = time.time()
+            if now - self.last_time < max_age:
+                return self.last
+            if not IS_LINUX:
+                usage = get_cpu_usage()
+                self.last = {
+                    "total": usage,
+                    "states": {},
+                    "cores": [usage] * 4,  # Mock visual for no-dep env
+                    "core_states": [],
+                }
+                self.last_time = now
+                return self.last
+            try:
+                counters = self.read_counters()
+            except:
+                return self.last
+            total, states = self.usage(counters.get(b"cpu", []), self.prev.get(b"cpu"))
+            cores, core_states = [], []
+            labels = sorted((k for k in counters if k != b"cpu"), key=lambda k: int(k[3:]))
+            for label in labels:
+                usage, cstates = self.usage(counters[label], self.prev.get(label))
+                cores.append(usage)
+                core_states.append(cstates)
+            self.prev = counters
+            self.last_time = now
+            self.last = {
+                "total": total,
+                "states": states,
+                "cores": cores,
+                "core_states": core_states,
+            }
+            return self.last
+
+
+CPU_SAMPLER = CpuSampler()
+
+
 def get_cpu_usage():
     try:
         if IS_LINUX:
-            with open("/proc/stat", "r") as f:
-                fields = f.readline().split()[1:]
-                return 100 - (int(fields[3]) * 100 // sum(int(x) for x in fields))
+            return CPU_SAMPLER.sample()["total"]
         elif IS_MAC:
             # Simple approximation for Mac without psutil
             cmd = "ps -A -o %cpu | awk '{s+=$1} END {print s}'"
@@ -256,6 +457,7 @@ class NetSpeed:
     def __init__(self):
         self.last_rx, self.last_tx, self.last_time = 0, 0, 0
         self.down_speed, self.up_speed = "0 B/s", "0 B/s"
+        self.rates = (0.0, 0.0)  # Bytes/s behind the strings, for the history
 
     def get_bytes(self):
         rx, tx = 0, 0
@@ -284,8 +486,9 @@ class NetSpeed:
         if self.last_time > 0:
             elapsed = now - self.last_time
             if elapsed > 0:
-                self.down_speed = self.format_speed((rx - self.last_rx) / elapsed)
-                self.up_speed = self.format_speed((tx - self.last_tx) / elapsed)
+                self.rates = ((rx - self.last_rx) / elapsed, (tx - self.last_tx) / elapsed)
+                self.down_speed = self.format_speed(self.rates[0])
+                self.up_speed = self.format_speed(self.rates[1])
         self.last_rx, self.last_tx, self.last_time = rx, tx, now
         return self.down_speed, self.up_speed
 
@@ -380,7 +583,10 @@ def get_open_ports():
         else:
             # Linux (ss) / Mac (netstat usually, ss if installed via brewed)
             # Default to ss for Linux, netstat for Mac
-            if IS_LINUX:
+            table = read_socket_table() if IS_LINUX else None
+            if table is not None:
+                ports = [str(p) for p in table["listen"] + table["listen_udp"]]
+            elif IS_LINUX:
                 result = subprocess.run(
                     ["ss", "-tuln"], capture_output=True, text=True, timeout=2
                 )
@@ -414,7 +620,10 @@ def get_open_ports():
 
 def get_connections():
     try:
-        if IS_LINUX:
+        table = read_socket_table() if IS_LINUX else None
+        if table is not None:
+            return str(table["established"])
+        elif IS_LINUX:
             result = subprocess.run(
                 ["ss", "-t", "state", "established"],
                 capture_output=True,
@@ -447,27 +656,14 @@ def get_disk_io():
 
 
 def get_per_core_cpu():
-    cores = []
     try:
-        if IS_LINUX:
-            with open("/proc/stat", "r") as f:
-                for line in f:
-                    if line.startswith("cpu") and line[3].isdigit():
-                        parts = line.split()[1:]
-                        total = sum(int(x) for x in parts)
-                        idle = int(parts[3])
-                        cores.append(100 - (idle * 100 // total) if total > 0 else 0)
-        # Windows/Mac complex without psutil, returning single avg as list or mock
-        elif IS_WINDOWS or IS_MAC:
-            usage = get_cpu_usage()
-            cores = [usage] * 4  # Mock visual for no-dep env
+        return list(CPU_SAMPLER.sample()["cores"]) or [0]
     except:
-        pass
-    return cores[:4] if cores else [0]
+        return [0]
 
 
-def get_processes():
-    """Get list of processes with PID, name, CPU%, time."""
+def _get_processes_ps():
+    """Get list of processes with PID, name, CPU%, time via ps/tasklist."""
     procs = []
     try:
         if IS_WINDOWS:
@@ -526,6 +722,17 @@ def get_processes():
     return procs
 
 
+def get_processes(sort="cpu", filt="", limit=50):
+    """Get processes sorted by `sort`, optionally filtered by name/user/pid."""
+    if IS_LINUX and os.path.isdir("/proc/self"):
+        return PROC_TABLE.top(sort, filt, limit)
+    procs = _get_processes_ps()
+    if filt:
+        f = filt.lower()
+        procs = [p for p in procs if f in p["name"].lower() or f == p["pid"]]
+    return procs[:limit]
+
+
 def scan_network():
     """Scan local network for devices."""
     devices = []
@@ -606,29 +813,1205 @@ def scan_network():
     return devices[:20]
 
 
+def _load_preview(filepath, size):
+    """Render every preview line of a file with a single open()."""
+    if size > 1048576:  # > 1MB
+        return ["[File too large to preview]", f"Size: {size // 1048576}MB"]
+    with open(filepath, "rb") as f:
+        data = f.read()
+    # Check if binary
+    if b"\x00" in data[:1024]:
+        return ["[Binary file]", f"Size: {size} bytes"]
+    return [l.rstrip()[:200] for l in data.decode(errors="replace").splitlines()]
+
+
 def read_file_preview(filepath, max_lines=50):
     """Read file for preview."""
     try:
         if os.path.isfile(filepath):
-            size = os.path.getsize(filepath)
-            if size > 1048576:  # > 1MB
-                return ["[File too large to preview]", f"Size: {size // 1048576}MB"]
-
-            # Check if binary
-            with open(filepath, "rb") as f:
-                chunk = f.read(1024)
-                if b"\x00" in chunk:
-                    return ["[Binary file]", f"Size: {size} bytes"]
-
-            # Read text
-            with open(filepath, "r", errors="replace") as f:
-                lines = f.readlines()[:max_lines]
-                return [l.rstrip()[:200] for l in lines]
+            return _load_preview(filepath, os.path.getsize(filepath))[:max_lines]
     except Exception as e:
         return [f"[Error: {e}]"]
     return ["[Cannot preview]"]
 
 
+class PreviewCache:
+    """LRU cache of rendered previews keyed on (path, mtime, size, inode).
+
+    A path is re-stat()ed at most every `revalidate` seconds, so redraws in
+    between are pure memory reads; a changed file gets a new key and is
+    rendered again. Memory is bounded by entry count and total characters.
+    """
+
+    def __init__(self, max_entries=64, max_chars=8 * 1048576, revalidate=0.5):
+        self.entries = OrderedDict()
+        self.keys = {}
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.revalidate = revalidate
+        self.chars = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def key_for(self, filepath):
+        now = time.monotonic()
+        cached = self.keys.get(filepath)
+        if cached and now - cached[1] < self.revalidate:
+            return cached[0]
+        st = os.stat(filepath)
+        key = (filepath, st.st_mtime_ns, st.st_size, st.st_ino)
+        self.keys[filepath] = (key, now)
+        return key
+
+    def get(self, filepath):
+        try:
+            key = self.key_for(filepath)
+            lines = self.entries.get(key)
+            if lines is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return lines
+            self.misses += 1
+            if not os.path.isfile(filepath):
+                self.keys.pop(filepath, None)  # Nothing cached: keys stays bounded
+                return ["[Cannot preview]"]
+            lines = _load_preview(filepath, key[2])
+        except Exception as e:
+            self.keys.pop(filepath, None)
+            return [f"[Error: {e}]"]
+        self.entries[key] = lines
+        self.chars += sum(len(l) for l in lines)
+        while len(self.entries) > 1 and (
+            len(self.entries) > self.max_entries or self.chars > self.max_chars
+        ):
+            (path, *_), old = self.entries.popitem(last=False)
+            self.chars -= sum(len(l) for l in old)
+            self.evictions += 1
+            if path in self.keys and self.keys[path][0] not in self.entries:
+                del self.keys[path]
+        return lines
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "chars": self.chars,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits * 100 / lookups if lookups else 0.0,
+        }
+
+
+PREVIEW_CACHE = PreviewCache()
+
+
+class ListPager:
+    """Scrollable view over a cached preview (files up to 1MB)."""
+
+    def __init__(self, filepath):
+        self.path = filepath
+        self.top = 0
+
+    def lines(self, count):
+        lines = PREVIEW_CACHE.get(self.path)
+        self.top = max(0, min(self.top, len(lines) - count))
+        return lines[self.top : self.top + count]
+
+    def scroll(self, n):
+        self.top = max(0, self.top + n)
+
+    def home(self):
+        self.top = 0
+
+    def end(self, page):
+        self.top = max(0, len(PREVIEW_CACHE.get(self.path)) - page)
+
+    def goto_line(self, n):
+        self.top = max(0, n - 1)
+
+    def goto_percent(self, pct):
+        self.top = len(PREVIEW_CACHE.get(self.path)) * pct // 100
+
+    def position(self):
+        total = len(PREVIEW_CACHE.get(self.path))
+        return f"L{min(self.top + 1, total)}/{total}"
+
+    def key(self):
+        """Changes whenever lines()/position() would; used to skip redraws."""
+        return self.top, PREVIEW_CACHE.get(self.path)
+
+    def deadline(self):
+        """Monotonic time this pager next needs a frame on its own, or None."""
+        return None
+
+    def close(self):
+        pass
+
+
+class MappedPager:
+    """Constant-memory pager over a memory-mapped file of any size.
+
+    Scrolling only searches for newlines around the current top offset. A
+    sparse index (the newline count before every INDEX_BLOCK bytes) is built
+    lazily, in time-bounded steps, when jumping to a line number; percentage,
+    top and bottom jumps never need it.
+    """
+
+    INDEX_BLOCK = 1 << 18
+    MAX_LINE = 65536  # Longer lines are paged in MAX_LINE segments
+    SCAN_BUDGET = 0.02  # Seconds of indexing per frame
+
+    def __init__(self, filepath):
+        import mmap
+
+        self.path = filepath
+        self.f = open(filepath, "rb")
+        st = os.fstat(self.f.fileno())
+        self.size, self.ino = st.st_size, st.st_ino
+        self.mm = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.index = array("Q", [0])
+        self.top = 0
+        self.top_line = 1  # None when reached by a byte offset jump
+        self.pending_line = None
+
+    def check(self):
+        """Remap if the file shrank or was replaced since it was mapped.
+
+        Touching mapped pages past a truncated end raises SIGBUS and kills
+        the whole process, so every entry point calls this first.
+        """
+        try:
+            shrunk = os.fstat(self.f.fileno()).st_size < self.size
+        except (OSError, ValueError):
+            shrunk = True
+        try:
+            replaced = os.stat(self.path).st_ino != self.ino
+        except OSError:
+            replaced = False  # Deleted: the open file still reads fine
+        if not (shrunk or replaced):
+            return
+        import mmap
+
+        self.close()
+        self.mm, self.size, self.ino = b"", 0, None  # Empty until it reopens
+        try:
+            self.f = open(self.path, "rb")
+            st = os.fstat(self.f.fileno())
+            self.ino = st.st_ino
+            if st.st_size:
+                self.mm = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+                self.size = len(self.mm)
+        except (OSError, ValueError):
+            pass
+        self.index = array("Q", [0])
+        self.top = self.line_start(min(self.top, self.size))
+        self.top_line = 1 if self.top == 0 else None
+
+    def next_start(self, off):
+        nl = self.mm.find(b"\n", off, min(self.size, off + self.MAX_LINE))
+        if nl != -1:
+            return nl + 1
+        return min(self.size, off + self.MAX_LINE)
+
+    def line_start(self, off):
+        """Start offset of the line containing `off`."""
+        if off <= 0:
+            return 0
+        nl = self.mm.rfind(b"\n", max(0, off - self.MAX_LINE), off)
+        return nl + 1 if nl != -1 else max(0, off - self.MAX_LINE)
+
+    def lines(self, count):
+        self.check()
+        self.pump()
+        out, off = [], self.top
+        while len(out) < count and off < self.size:
+            end = self.next_start(off)
+            out.append(self.mm[off : min(end, off + 800)].decode(errors="replace").rstrip()[:200])
+            off = end
+        return out
+
+    def scroll(self, n):
+        self.check()
+        self.pending_line = None
+        for _ in range(abs(n)):
+            if n > 0:
+                nxt = self.next_start(self.top)
+                if nxt >= self.size:
+                    break
+                self.top = nxt
+            else:
+                if self.top == 0:
+                    break
+                self.top = self.line_start(self.top - 1)
+            if self.top_line is not None:
+                self.top_line += 1 if n > 0 else -1
+
+    def home(self):
+        self.top, self.top_line, self.pending_line = 0, 1, None
+
+    def end(self, page):
+        self.check()
+        self.pending_line = None
+        self.top, self.top_line = self.size, None
+        if self.size and self.mm[self.size - 1 : self.size] == b"\n":
+            self.top -= 1
+        for _ in range(page):
+            if self.top == 0:
+                break
+            self.top = self.line_start(self.top - 1)
+
+    def goto_percent(self, pct):
+        self.check()
+        self.pending_line = None
+        self.top = self.line_start(self.size * min(100, max(0, pct)) // 100)
+        self.top_line = 1 if self.top == 0 else None
+
+    def goto_line(self, n):
+        self.pending_line = max(1, n)
+        self.pump()
+
+    def pump(self):
+        """Advance a pending line jump within this frame's time budget."""
+        if self.pending_line is None:
+            return
+        self.check()
+        target = self.pending_line - 1
+        deadline = time.monotonic() + self.SCAN_BUDGET
+        while self.index[-1] < target and self.indexed() < self.size:
+            if time.monotonic() > deadline:
+                return
+            start = self.indexed()
+            block = self.mm[start : min(self.size, start + self.INDEX_BLOCK)]
+            self.index.append(self.index[-1] + block.count(b"\n"))
+        k = min(bisect_right(self.index, target) - 1, max(0, self.size - 1) // self.INDEX_BLOCK)
+        off, line = k * self.INDEX_BLOCK, self.index[k]
+        if line == target:
+            off = self.line_start(off)
+        while line < target:
+            nl = self.mm.find(b"\n", off)
+            if nl == -1 or nl + 1 >= self.size:
+                break
+            off, line = nl + 1, line + 1
+        self.top, self.top_line, self.pending_line = off, line + 1, None
+
+    def indexed(self):
+        return min(self.size, (len(self.index) - 1) * self.INDEX_BLOCK)
+
+    def position(self):
+        pct = self.top * 100 // self.size if self.size else 100
+        if self.pending_line is not None:
+            return f"indexing {self.indexed() * 100 // max(1, self.size)}%"
+        line = f"L{self.top_line}" if self.top_line is not None else "L?"
+        return f"{line} {pct}%"
+
+    def key(self):
+        return self.top, self.top_line, self.pending_line, len(self.index)
+
+    def deadline(self):
+        # A pending line jump indexes a slice per frame until it lands
+        return time.monotonic() if self.pending_line is not None else None
+
+    def close(self):
+        for handle in (self.mm, self.f):
+            try:
+                handle.close()
+            except:
+                pass
+
+
+class FollowPager:
+    """tail -f for the PREVIEW pane.
+
+    Growth is detected with size/inode checks; only newly appended bytes are
+    read, rotation (inode change) and truncation (size shrink) restart from
+    the top of the file, and the last FOLLOW_LINES lines are kept in a ring.
+    """
+
+    FOLLOW_LINES = 5000
+    POLL_INTERVAL = 0.25
+    TAIL_BYTES = 65536  # Initial backfill and catch-up window
+    MAX_READ = 4 * 1048576
+
+    def __init__(self, filepath):
+        self.path = filepath
+        self.ring = deque(maxlen=self.FOLLOW_LINES)
+        self.partial = b""
+        self.f = None
+        self.ino = None
+        self.offset = 0
+        self.last_poll = 0
+        self.back = 0  # Lines scrolled back from the tail; 0 = following
+        self.version = 0
+        self._open(tail=True)
+
+    def _open(self, tail=False):
+        if self.f is not None:
+            self.f.close()
+        self.f = open(self.path, "rb")
+        st = os.fstat(self.f.fileno())
+        self.ino = st.st_ino
+        self.partial = b""
+        self.offset = 0
+        if tail and st.st_size > self.TAIL_BYTES:
+            self.offset = st.st_size - self.TAIL_BYTES
+            self.f.seek(self.offset)
+            self.offset += len(self.f.readline())  # Skip the cut-off line
+        self._read(st.st_size)
+
+    def _read(self, size):
+        if size - self.offset > self.MAX_READ:
+            # Fell far behind: skip ahead rather than replay megabytes
+            self.offset = size - self.TAIL_BYTES
+            self.partial = b""
+            self.ring.append("[... skipped ...]")
+        self.f.seek(self.offset)
+        data = self.f.read(size - self.offset)
+        if not data:
+            return
+        self.offset += len(data)
+        chunks = (self.partial + data).split(b"\n")
+        self.partial = chunks.pop()
+        for chunk in chunks:
+            self.ring.append(chunk.decode(errors="replace").rstrip()[:200])
+        if self.back:
+            self.back += len(chunks)
+        self.version += 1
+
+    def poll(self):
+        now = time.monotonic()
+        if now - self.last_poll < self.POLL_INTERVAL:
+            return
+        self.last_poll = now
+        try:
+            st = os.stat(self.path)
+            if st.st_ino != self.ino:
+                self.ring.append("[--- file rotated ---]")
+                self._open()
+            elif st.st_size < self.offset:
+                self.ring.append("[--- file truncated ---]")
+                self._open()
+            elif st.st_size > self.offset:
+                self._read(st.st_size)
+        except OSError:
+            pass
+
+    def lines(self, count):
+        self.poll()
+        lines = list(self.ring)
+        if self.partial:
+            lines.append(self.partial.decode(errors="replace").rstrip()[:200])
+        self.back = max(0, min(self.back, len(lines) - count))
+        end = len(lines) - self.back
+        return lines[max(0, end - count) : end]
+
+    def scroll(self, n):
+        self.back = max(0, self.back - n)
+
+    def home(self):
+        self.back = len(self.ring)
+
+    def end(self, page):
+        self.back = 0
+
+    def goto_line(self, n):
+        self.back = max(0, len(self.ring) - n)
+
+    def goto_percent(self, pct):
+        self.back = len(self.ring) * (100 - pct) // 100
+
+    def position(self):
+        return f"PAUSED -{self.back}" if self.back else "FOLLOW"
+
+    def key(self):
+        self.poll()
+        return self.version, self.back
+
+    def deadline(self):
+        return self.last_poll + self.POLL_INTERVAL
+
+    def close(self):
+        try:
+            self.f.close()
+        except:
+            pass
+
+
+def is_log_file(filepath):
+    name = os.path.basename(filepath).lower()
+    return name.endswith(".log") or ".log." in name or filepath.startswith("/var/log/")
+
+
+def open_pager(filepath, follow=False, size=None):
+    """Pick a pager for the file: tail, mmap for large text files, else the cache.
+
+    `size` may come from the browser's cached metadata to skip a stat. Binary
+    files (a NUL in the first 1K, as in the plain preview) always get the
+    cache, so wtmp, lastlog or journal files under /var/log are not tailed.
+    """
+    try:
+        with open(filepath, "rb") as f:
+            if b"\x00" in f.read(1024):
+                return ListPager(filepath)
+        if follow:
+            return FollowPager(filepath)
+        if size is None:
+            size = os.path.getsize(filepath)
+        if size > 1048576:
+            return MappedPager(filepath)
+    except:
+        pass
+    return ListPager(filepath)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROCESS TABLE
+# ═══════════════════════════════════════════════════════════════════════════════
+def format_size(n):
+    for unit in ("B", "K", "M", "G", "T"):
+        if n < 1024 or unit == "T":
+            return f"{n:.0f}{unit}" if unit == "B" else f"{n:.1f}{unit}"
+        n /= 1024
+
+
+def format_etime(secs):
+    """Elapsed time in ps etime style: [[dd-]hh:]mm:ss."""
+    secs = int(max(0, secs))
+    days, secs = divmod(secs, 86400)
+    hours, secs = divmod(secs, 3600)
+    mins, secs = divmod(secs, 60)
+    if days:
+        return f"{days}-{hours:02d}:{mins:02d}:{secs:02d}"
+    if hours:
+        return f"{hours:02d}:{mins:02d}:{secs:02d}"
+    return f"{mins:02d}:{secs:02d}"
+
+
+class ProcTable:
+    """Native /proc process scanner.
+
+    Per-PID state survives between scans so CPU% and I/O are interval rates
+    rather than lifetime averages. The stat/statm descriptors of live processes
+    stay open (up to FD_BUDGET, well under RLIMIT_NOFILE) and are re-read
+    with pread, so a steady-state scan of the busiest PIDs costs one syscall
+    per file.
+    """
+
+    SORT_KEYS = ("cpu", "mem", "io", "threads", "pid", "name")
+    FD_BUDGET = 256  # Cached descriptors; the rest of the fd table is the app's
+
+    def __init__(self):
+        self.state = {}
+        self.procs = []
+        self.last_time = 0
+        self.lock = threading.Lock()
+        self.users = {}
+        self.sort = "cpu"
+        self.filter = ""
+        self.fds_open = 0
+        self.fd_budget = 0
+        self.clk, self.page = 100, 4096
+        try:
+            self.clk = os.sysconf("SC_CLK_TCK")
+            self.page = os.sysconf("SC_PAGE_SIZE")
+            import resource
+
+            soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+            if soft == resource.RLIM_INFINITY:
+                soft = 65536
+            self.fd_budget = max(0, min(self.FD_BUDGET, soft // 4))
+        except:
+            pass
+
+    def _read(self, st, key, path):
+        fd = st.get(key)
+        if fd is not None:
+            try:
+                return os.pread(fd, 4096, 0)
+            except OSError:
+                # Process exited (or the PID was reused): drop the stale fd
+                self._close(st, key)
+        if self.fds_open < self.fd_budget:
+            fd = os.open(path, os.O_RDONLY)
+            st[key] = fd
+            self.fds_open += 1
+            return os.pread(fd, 4096, 0)
+        with open(path, "rb") as f:
+            return f.read()
+
+    def _close(self, st, key):
+        fd = st.pop(key, None)
+        if fd is not None:
+            self.fds_open -= 1
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _drop(self, pid):
+        st = self.state.pop(pid, None)
+        if st:
+            self._close(st, "stat")
+            self._close(st, "statm")
+
+    def _user(self, pid):
+        try:
+            with open(f"/proc/{pid}/status", "rb") as f:
+                for line in f:
+                    if line.startswith(b"Uid:"):
+                        uid = int(line.split()[1])
+                        break
+                else:
+                    return "?"
+        except OSError:
+            return "?"
+        if uid not in self.users:
+            try:
+                import pwd
+
+                self.users[uid] = pwd.getpwuid(uid).pw_name
+            except:
+                self.users[uid] = str(uid)
+        return self.users[uid]
+
+    def _io(self, pid, st):
+        if st.get("io") is False:
+            return None
+        try:
+            with open(f"/proc/{pid}/io", "rb") as f:
+                rd = wr = 0
+                for line in f:
+                    if line.startswith(b"read_bytes:"):
+                        rd = int(line.split()[1])
+                    elif line.startswith(b"write_bytes:"):
+                        wr = int(line.split()[1])
+                return rd, wr
+        except OSError:
+            st["io"] = False  # Not ours to read; don't retry every scan
+            return None
+
+    def _sample(self, pid, st, elapsed, uptime):
+        try:
+            data = self._read(st, "stat", f"/proc/{pid}/stat")
+            statm = self._read(st, "statm", f"/proc/{pid}/statm").split()
+        except OSError:
+            return None
+        if not data:
+            return None
+        # comm may itself contain spaces and parentheses
+        r = data.rfind(b")")
+        name = data[data.find(b"(") + 1 : r].decode(errors="replace")
+        f = data[r + 2 :].split()
+        ticks = int(f[11]) + int(f[12])
+        start = int(f[19])
+        if st.get("start") != start:
+            # New process (or PID reuse): reset interval state
+            for key in ("ticks", "io", "io_prev", "user"):
+                st.pop(key, None)
+            st["start"] = start
+            st["user"] = self._user(pid)
+        if "ticks" in st and elapsed > 0:
+            cpu = (ticks - st["ticks"]) / self.clk / elapsed * 100
+        else:
+            cpu = ticks / self.clk / max(uptime - start / self.clk, 0.01) * 100
+        st["ticks"] = ticks
+        read_bps = write_bps = 0.0
+        io = self._io(pid, st)
+        if io is not None:
+            prev = st.get("io_prev")
+            if prev and elapsed > 0:
+                read_bps = max(0, io[0] - prev[0]) / elapsed
+                write_bps = max(0, io[1] - prev[1]) / elapsed
+            st["io_prev"] = io
+        etime = uptime - start / self.clk
+        return {
+            "pid": pid,
+            "ppid": int(f[1]),
+            "name": name[:15],
+            "user": st["user"],
+            "state": f[0].decode(),
+            "cpu": round(cpu, 1),
+            "rss": int(statm[1]) * self.page,
+            "vsz": int(statm[0]) * self.page,
+            "threads": int(f[17]),
+            "read_bps": read_bps,
+            "write_bps": write_bps,
+            "etime": etime,
+            "time": format_etime(etime),
+        }
+
+    def scan(self):
+        """Walk /proc once and refresh every process entry."""
+        with self.lock:
+            now = time.monotonic()
+            elapsed = now - self.last_time if self.last_time else 0
+            try:
+                with open("/proc/uptime", "rb") as f:
+                    uptime = float(f.read().split()[0])
+            except:
+                uptime = time.time() - START_TIME
+            procs, seen = [], set()
+            try:
+                with os.scandir("/proc") as it:
+                    for entry in it:
+                        if not entry.name.isdigit():
+                            continue
+                        pid = int(entry.name)
+                        st = self.state.setdefault(pid, {})
+                        info = self._sample(pid, st, elapsed, uptime)
+                        if info is None:
+                            self._drop(pid)
+                            continue
+                        seen.add(pid)
+                        procs.append(info)
+            except OSError:
+                pass
+            for pid in [p for p in self.state if p not in seen]:
+                self._drop(pid)
+            self.last_time = now
+            self.procs = procs
+            return procs
+
+    def query(self, sort="cpu", filt="", limit=None):
+        procs = self.procs
+        if filt:
+            f = filt.lower()
+            procs = [
+                p
+                for p in procs
+                if f in p["name"].lower() or f in p["user"].lower() or f == str(p["pid"])
+            ]
+        keys = {
+            "cpu": lambda p: p["cpu"],
+            "mem": lambda p: p["rss"],
+            "io": lambda p: p["read_bps"] + p["write_bps"],
+            "threads": lambda p: p["threads"],
+            "pid": lambda p: p["pid"],
+            "name": lambda p: p["name"].lower(),
+        }
+        procs = sorted(procs, key=keys.get(sort, keys["cpu"]), reverse=sort not in ("pid", "name"))
+        return procs[:limit] if limit else procs
+
+    def top(self, sort="cpu", filt="", limit=50, max_age=2.0):
+        """Query a fresh table, priming it first if it has gone stale."""
+        age = time.monotonic() - self.last_time
+        if age > max_age:
+            if not self.last_time or age > 10:
+                self.scan()
+                time.sleep(0.25)
+            self.scan()
+        return self.query(sort, filt, limit)
+
+    def view(self):
+        """Scan and return the rows shown by the PROCESSES pane."""
+        self.scan()
+        return self.query(self.sort, self.filter, 200)
+
+
+PROC_TABLE = ProcTable()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SOCKET TABLE
+# ═══════════════════════════════════════════════════════════════════════════════
+TCP_STATES = (
+    "UNKNOWN", "ESTABLISHED", "SYN_SENT", "SYN_RECV", "FIN_WAIT1", "FIN_WAIT2",
+    "TIME_WAIT", "CLOSE", "CLOSE_WAIT", "LAST_ACK", "LISTEN", "CLOSING",
+)
+
+
+def decode_proc_addr(hexaddr):
+    """Decode a /proc/net address ("0100007F" or 32 hex chars) to an IP string."""
+    raw = bytes.fromhex(hexaddr.decode() if isinstance(hexaddr, bytes) else hexaddr)
+    if len(raw) == 4:
+        return socket.inet_ntop(socket.AF_INET, raw[::-1])
+    # IPv6 is stored as four host-order 32-bit words
+    raw = b"".join(raw[i : i + 4][::-1] for i in range(0, 16, 4))
+    if raw[:12] == b"\x00" * 10 + b"\xff\xff":
+        return socket.inet_ntop(socket.AF_INET, raw[12:])
+    return socket.inet_ntop(socket.AF_INET6, raw)
+
+
+def read_socket_table(top_hosts=5):
+    """Summarize /proc/net/{tcp,tcp6,udp,udp6} in a single streaming pass.
+
+    Lines are sliced at fixed offsets instead of split, and remote addresses
+    are only aggregated as raw hex keys; just the busiest peers get decoded.
+    Returns None when the kernel tables are unavailable.
+    """
+    listen_tcp, listen_udp = set(), set()
+    states = [0] * len(TCP_STATES)
+    remotes = {}
+    total = 0
+    found = False
+    for proto in ("tcp", "tcp6", "udp", "udp6"):
+        try:
+            f = open(f"/proc/net/{proto}", "rb", buffering=1 << 16)
+        except OSError:
+            continue
+        found = True
+        # "%08X:%04X" for IPv4, "%08X%08X%08X%08X:%04X" for IPv6
+        addr_w = 13 if proto in ("tcp", "udp") else 37
+        is_tcp = proto.startswith("tcp")
+        with f:
+            f.readline()
+            for line in f:
+                i = line.find(b":") + 2
+                if i < 2:
+                    continue
+                st_off = i + 2 * addr_w + 2
+                try:
+                    st = int(line[st_off : st_off + 2], 16)
+                    port = int(line[i + addr_w - 4 : i + addr_w], 16)
+                except ValueError:
+                    continue
+                total += 1
+                if is_tcp:
+                    if st < len(states):
+                        states[st] += 1
+                    if st == 10:
+                        listen_tcp.add(port)
+                    elif st == 1:
+                        key = line[i + addr_w + 1 : i + 2 * addr_w - 4]
+                        remotes[key] = remotes.get(key, 0) + 1
+                elif st == 7:
+                    listen_udp.add(port)
+    if not found:
+        return None
+    busiest = sorted(remotes.items(), key=lambda kv: kv[1], reverse=True)[:top_hosts]
+    peers = []
+    for key, count in busiest:
+        try:
+            peers.append((decode_proc_addr(key), count))
+        except (ValueError, OSError):
+            pass
+    return {
+        "listen": sorted(listen_tcp),
+        "listen_udp": sorted(listen_udp),
+        "states": {TCP_STATES[i]: n for i, n in enumerate(states) if n},
+        "established": states[1],
+        "remotes": peers,
+        "total": total,
+    }
+
+
+def get_socket_summary():
+    """Socket table summary for the MONITOR panel on any platform."""
+    if IS_LINUX:
+        table = read_socket_table()
+        if table is not None:
+            return table
+    ports = [p for p in get_open_ports() if p.isdigit()]
+    try:
+        est = int(get_connections())
+    except:
+        est = 0
+    return {
+        "listen": sorted(int(p) for p in ports),
+        "listen_udp": [],
+        "states": {"ESTABLISHED": est} if est else {},
+        "established": est,
+        "remotes": [],
+        "total": est + len(ports),
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TELEMETRY COLLECTOR
+# ═══════════════════════════════════════════════════════════════════════════════
+def _freeze(value):
+    """Make a collected value safe to share between threads."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class Collector:
+    """Runs each telemetry function on its own schedule in a worker thread.
+
+    Workers publish into an immutable snapshot that is swapped atomically, so
+    the render loop only ever reads the latest values and never waits on I/O.
+    """
+
+    MAX_BACKOFF = 4  # Unchanged values stretch a task's interval up to this factor
+
+    def __init__(self):
+        self.tasks = {}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.started = False
+        self.scale = 1  # Multiplies every interval; raised when idle/unfocused
+        self.version = 0
+        self.ready = set()  # Tasks that have produced a value, not just a default
+        self._data = {}
+        self.snapshot = MappingProxyType(self._data)
+
+    def add(self, name, func, interval, default=None, enabled=True):
+        self.tasks[name] = {
+            "func": func,
+            "interval": interval,
+            "enabled": enabled,
+            "wake": threading.Event(),
+            "thread": None,
+            "times": deque(maxlen=256),  # Recent run durations, for the profiler
+            "errors": 0,
+        }
+        self.publish(name, default)
+
+    def set_enabled(self, name, enabled):
+        task = self.tasks[name]
+        if task["enabled"] != enabled:
+            task["enabled"] = enabled
+            task["wake"].set()
+
+    def trigger(self, name):
+        """Run a task now instead of waiting for its next tick."""
+        self.tasks[name]["wake"].set()
+
+    def set_interval(self, name, interval):
+        task = self.tasks.get(name)
+        if task is None:
+            return False
+        task["interval"] = max(0.1, float(interval))
+        task["wake"].set()
+        return True
+
+    def set_scale(self, scale):
+        if scale == self.scale:
+            return
+        faster = scale < self.scale
+        self.scale = scale
+        if faster:
+            # Coming back from idle: refresh now rather than after a long wait
+            for task in self.tasks.values():
+                task["wake"].set()
+
+    def publish(self, name, value):
+        with self.lock:
+            data = dict(self._data)
+            data[name] = _freeze(value)
+            self._data = data
+            self.snapshot = MappingProxyType(data)
+            self.version += 1
+        WAKER.wake()
+
+    def get(self):
+        return self.snapshot
+
+    def run_task(self, name):
+        task = self.tasks[name]
+        started = time.perf_counter()
+        try:
+            value = task["func"]()
+        except:
+            task["errors"] += 1
+            return
+        finally:
+            task["times"].append(time.perf_counter() - started)
+        self.ready.add(name)
+        self.publish(name, value)
+
+    def _worker(self, name):
+        task = self.tasks[name]
+        backoff = 1
+        while not self.stop_event.is_set():
+            timeout = None
+            if task["enabled"]:
+                started = time.time()
+                before = self._data.get(name)
+                self.run_task(name)
+                if self._data.get(name) == before:
+                    backoff = min(backoff * 2, self.MAX_BACKOFF)
+                else:
+                    backoff = 1
+                interval = task["interval"] * self.scale * backoff
+                timeout = max(0.0, interval - (time.time() - started))
+            task["wake"].wait(timeout)
+            task["wake"].clear()
+
+    def start(self):
+        if self.started:
+            return
+        self.started = True
+        self.stop_event.clear()
+        for name, task in self.tasks.items():
+            task["thread"] = threading.Thread(
+                target=self._worker, args=(name,), name=f"collector-{name}", daemon=True
+            )
+            task["thread"].start()
+
+    def stop(self):
+        self.stop_event.set()
+        for task in self.tasks.values():
+            task["wake"].set()
+        self.started = False
+
+
+COLLECTOR = Collector()
+# SYSTEM panel
+COLLECTOR.add(
+    "cpu", CPU_SAMPLER.sample, 1, {"total": 0, "states": {}, "cores": [], "core_states": []}
+)
+COLLECTOR.add("mem", get_memory_usage, 2, ("N/A", 0))
+COLLECTOR.add("disk", get_disk_usage, 5, ("N/A", 0))
+COLLECTOR.add("load", get_load_avg, 2, "0.00")
+COLLECTOR.add("net_info", get_network_info, 5, {"ssid": "N/A", "ip": "N/A"})
+COLLECTOR.add("ping", ping_host, 5, "---")
+COLLECTOR.add("net_speed", NET_SPEED.update, 2, ("0 B/s", "0 B/s"))
+# MONITOR panel
+COLLECTOR.add("temp", get_cpu_temp, 2, "N/A")
+COLLECTOR.add("gpu", get_gpu_usage, 2, "N/A")
+COLLECTOR.add("bat", get_battery, 10, "N/A")
+COLLECTOR.add(
+    "sockets",
+    get_socket_summary,
+    2,
+    {"listen": [], "listen_udp": [], "states": {}, "established": 0, "remotes": [], "total": 0},
+)
+COLLECTOR.add("dio", get_disk_io, 2, "N/A")
+# PROCESSES panel (only scanned while the pane is open)
+COLLECTOR.add("procs", lambda: PROC_TABLE.view(), 2, [], enabled=False)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# METRIC HISTORY
+# ═══════════════════════════════════════════════════════════════════════════════
+SPARK_BLOCKS = "▁▂▃▄▅▆▇█"
+
+
+class MetricSeries:
+    """Fixed-size history of one metric: 1s samples for 10 minutes, 1m for a day.
+
+    Both tiers are preallocated array('f') rings indexed by absolute second or
+    minute, so memory never grows with uptime. A minute's value is the mean of
+    the samples taken in it; seconds and minutes the sampler skipped
+    (collector back-off) hold the previous value.
+    """
+
+    FINE = 600
+    COARSE = 1440
+
+    def __init__(self, top=None):
+        self.fine = array("f", bytes(4 * self.FINE))
+        self.coarse = array("f", bytes(4 * self.COARSE))
+        self.top = top  # Fixed scale (e.g. 100 for percentages); None = autoscale
+        self.first = None  # First recorded second
+        self.second = None  # Newest recorded second
+        self.minute_sum = 0.0
+        self.minute_n = 0
+        self.version = 0
+        self.cache = None  # (version, width, coarse, sparkline)
+
+    def add(self, value, now):
+        sec = int(now)
+        if self.second is None:
+            self.first = self.second = sec
+            self.fine[sec % self.FINE] = value
+        elif sec <= self.second:
+            self.fine[self.second % self.FINE] = value
+        else:
+            prev = self.fine[self.second % self.FINE]
+            for s in range(max(self.second + 1, sec - self.FINE + 1), sec):
+                self.fine[s % self.FINE] = prev
+            self.fine[sec % self.FINE] = value
+            minute, last = sec // 60, self.second // 60
+            if minute != last:
+                mean = self.minute_sum / max(1, self.minute_n)
+                for m in range(max(last, minute - self.COARSE + 1), minute):
+                    self.coarse[m % self.COARSE] = mean
+                self.minute_sum, self.minute_n = 0.0, 0
+            self.second = sec
+        self.minute_sum += value
+        self.minute_n += 1
+        self.version += 1
+
+    def tail(self, n, coarse=False):
+        """The newest n values, oldest first; None before recording started."""
+        if self.second is None:
+            return [None] * n
+        if coarse:
+            end, first = self.second // 60, self.first // 60
+            ring, size = self.coarse, self.COARSE
+        else:
+            end, first, ring, size = self.second, self.first, self.fine, self.FINE
+        out = []
+        for t in range(end - n + 1, end + 1):
+            if t < first or end - t >= size:
+                out.append(None)
+            elif coarse and t == end:
+                out.append(self.minute_sum / max(1, self.minute_n))  # Minute so far
+            else:
+                out.append(ring[t % size])
+        return out
+
+    def sparkline(self, width, coarse=False):
+        """One cell per second (or minute), rebuilt only after new samples."""
+        cache = self.cache
+        if cache is not None and cache[:3] == (self.version, width, coarse):
+            return cache[3]
+        values = self.tail(width, coarse)
+        top = self.top or max((v for v in values if v is not None), default=0) or 1
+        line = "".join(
+            " " if v is None else SPARK_BLOCKS[max(0, min(7, int(v / top * 8)))]
+            for v in values
+        )
+        self.cache = (self.version, width, coarse, line)
+        return line
+
+
+class MetricHistory:
+    """Samples numeric views of the collector snapshot into MetricSeries."""
+
+    def __init__(self):
+        self.series = {}
+        self.sources = {}
+        self.version = 0
+
+    def track(self, name, source, top=None):
+        self.series[name] = MetricSeries(top)
+        self.sources[name] = source
+
+    def sample(self):
+        snap, now = COLLECTOR.get(), time.time()
+        for name, source in self.sources.items():
+            try:
+                value = float(source(snap))
+            except (TypeError, ValueError, KeyError, IndexError, AttributeError):
+                continue  # "N/A" and friends: leave a gap rather than a zero
+            self.series[name].add(value, now)
+        self.version += 1
+        return self.version
+
+    def sparkline(self, name, width, coarse=False):
+        return self.series[name].sparkline(width, coarse)
+
+
+HISTORY = MetricHistory()
+
+
+def track_history():
+    """Start sampling the dashboard graphs; only the TUI draws them."""
+    HISTORY.track("cpu", lambda s: s["cpu"]["total"], 100)
+    HISTORY.track("mem", lambda s: s["mem"][1], 100)
+    HISTORY.track("disk", lambda s: s["disk"][1], 100)
+    HISTORY.track("load", lambda s: s["load"])
+    HISTORY.track("down", lambda s: NET_SPEED.rates[0])
+    HISTORY.track("up", lambda s: NET_SPEED.rates[1])
+    HISTORY.track("ping", lambda s: s["ping"].rstrip("ms"))
+    HISTORY.track("temp", lambda s: s["temp"].rstrip("°C"))
+    HISTORY.track("conn", lambda s: s["sockets"]["established"])
+    # Publishes a counter, so panels showing sparklines redraw once per sample
+    COLLECTOR.add("history", HISTORY.sample, 1, 0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SELF INSTRUMENTATION
+# ═══════════════════════════════════════════════════════════════════════════════
+class Profiler:
+    """What SPECTRAL itself costs: draw and input-to-paint times, collector
+    latencies, bytes written and the process's own CPU and RSS.
+    """
+
+    WINDOW = 256  # Samples kept per series for the average and p99
+
+    def __init__(self):
+        self.series = {}  # "frame", "input" or a draw_* method -> seconds
+        self.started = time.monotonic()
+        self.last = None  # (monotonic, CPU seconds, bytes written) at last sample
+        self.usage = (0.0, 0, 0.0)  # CPU %, RSS bytes, bytes written per second
+
+    def record(self, name, seconds):
+        series = self.series.get(name)
+        if series is None:
+            series = self.series[name] = deque(maxlen=self.WINDOW)
+        series.append(seconds)
+
+    @staticmethod
+    def summary(samples):
+        """Last, mean and 99th percentile of a series, or None if empty."""
+        samples = list(samples)
+        if not samples:
+            return None
+        ranked = sorted(samples)
+        p99 = ranked[min(len(ranked) - 1, len(ranked) * 99 // 100)]
+        return samples[-1], sum(samples) / len(samples), p99
+
+    @staticmethod
+    def written():
+        """Bytes written by this process so far; terminal output dominates."""
+        try:
+            with open("/proc/self/io") as f:
+                for line in f:
+                    if line.startswith("wchar:"):
+                        return int(line.split()[1])
+        except (OSError, ValueError):
+            pass
+        return None
+
+    @staticmethod
+    def rss():
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            pass
+        try:
+            import resource
+
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak if IS_MAC else peak * 1024  # Peak; current is unknown here
+        except ImportError:
+            return 0
+
+    def sample(self):
+        """Refresh CPU %, RSS and output rate over the time since the last call."""
+        now = time.monotonic()
+        cpu, out = time.process_time(), self.written() or 0
+        if self.last is not None:
+            span = now - self.last[0]
+            self.usage = (
+                100 * (cpu - self.last[1]) / span,
+                self.rss(),
+                (out - self.last[2]) / span,
+            )
+        self.last = (now, cpu, out)
+
+    def line(self, label, samples, extra=""):
+        stats = self.summary(samples)
+        if stats is None:
+            return f"{label:<14}{'-':>8}{'-':>8}{'-':>8}{extra}"
+        return f"{label:<14}" + "".join(f"{t * 1000:8.2f}" for t in stats) + extra
+
+    def rows(self):
+        """Timing tables in milliseconds, shared by the overlay and the report."""
+        rows = [f"{'frame':<14}{'last':>8}{'avg':>8}{'p99':>8}"]
+        rows.append(self.line(" total", self.series.get("frame", ())))
+        for name in sorted(self.series):
+            if name.startswith("draw_"):
+                rows.append(self.line(" " + name[5:], self.series[name]))
+        rows.append(self.line("input→paint", self.series.get("input", ())))
+        rows.append(f"{'collector':<14}{'last':>8}{'avg':>8}{'p99':>8}{'err':>5}")
+        for name, task in COLLECTOR.tasks.items():
+            rows.append(self.line(" " + name, task["times"], f"{task['errors']:>5}"))
+        return rows
+
+    def report(self):
+        """Whole-run figures for --profile."""
+        span = max(time.monotonic() - self.started, 1e-9)
+        out = self.written()
+        rate = NET_SPEED.format_speed(out / span) if out is not None else "n/a"
+        head = [
+            f"SPECTRAL profile, {span:.1f}s (times in ms)",
+            f"cpu {100 * time.process_time() / span:.1f}%  "
+            f"rss {format_size(self.rss())}  written {rate}",
+            "",
+        ]
+        return "\n".join(head + self.rows()) + "\n"
+
+
+PROFILER = Profiler()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # ASCII LOGO
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -645,55 +2028,343 @@ LOGO = [
 # ═══════════════════════════════════════════════════════════════════════════════
 # FILESYSTEM BROWSER
 # ═══════════════════════════════════════════════════════════════════════════════
+KIND_DIR, KIND_FILE, KIND_LINK_DIR, KIND_LINK_FILE, KIND_BROKEN, KIND_OTHER = range(6)
+KIND_ICONS = ("📂", "📄", "🔗", "🔗", "⛔", "🔌")
+DIR_KINDS = (KIND_DIR, KIND_LINK_DIR)
+FILE_KINDS = (KIND_FILE, KIND_LINK_FILE)
+
+
+class NameTable:
+    """Sorted names packed into one bytes blob plus an offset array.
+
+    Costs about len(name) + 8 bytes per entry instead of a str object and a
+    list slot; a name is only decoded when a row is drawn or compared.
+    """
+
+    def __init__(self, names=()):
+        encoded = [n.encode("utf-8", "surrogateescape") for n in names]
+        self.blob = b"".join(encoded)
+        self.offsets = array("Q", [0])
+        total = 0
+        for n in map(len, encoded):
+            total += n
+            self.offsets.append(total)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.blob[self.offsets[i] : self.offsets[i + 1]].decode(
+            "utf-8", "surrogateescape"
+        )
+
+
+class DirListing:
+    """One directory's entries, built from os.scandir dirent types.
+
+    Loading streams in a background thread: entries are batched, sorted and
+    merged into the published view (directories first, each group sorted),
+    with batches doubling in size so a huge directory costs O(n log n)
+    overall while the first screenful appears immediately. `view` is replaced
+    atomically as a (NameTable, kinds, ndirs) tuple, so readers never see
+    names and kinds out of step, and nothing per-row is materialized until a
+    row is actually drawn.
+
+    Size/mtime/mode are captured at most once per entry: during the scan for
+    symlinks (which need a stat anyway to classify) and, for everything else,
+    by a background thread the first time a row asks for them.
+    """
+
+    FLUSH_INTERVAL = 0.5
+
+    def __init__(self, path):
+        self.path = path
+        self.view = (NameTable(), bytearray(), 0)
+        self.meta = {}
+        self.meta_version = 0  # Bumped as background stats land
+        self.wanted = set()  # Names waiting for a background stat
+        self.stat_lock = threading.Lock()
+        self.statting = False
+        self.error = None
+        self.scanned = 0
+        self.loading = False
+        self.version = 0
+        self.cancelled = threading.Event()
+        self.first = threading.Event()
+
+    @staticmethod
+    def classify(entry):
+        """Return (kind, stat-or-None) for a DirEntry."""
+        if entry.is_symlink():
+            try:
+                st = entry.stat()
+            except OSError:
+                return KIND_BROKEN, None
+            return (KIND_LINK_DIR if stat.S_ISDIR(st.st_mode) else KIND_LINK_FILE), st
+        if entry.is_dir(follow_symlinks=False):
+            return KIND_DIR, None
+        if entry.is_file(follow_symlinks=False):
+            return KIND_FILE, None
+        return KIND_OTHER, None
+
+    def load(self):
+        """Scan synchronously."""
+        self.loading = True
+        self._scan()
+        return self
+
+    def load_async(self, wait=0.05):
+        """Scan in a background thread; wait briefly for the first screenful."""
+        self.loading = True
+        threading.Thread(target=self._scan, name="dir-loader", daemon=True).start()
+        self.first.wait(wait)
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def _scan(self):
+        dirs, files, special = [], [], {}
+        pending_dirs, pending_files = [], []
+        last_flush = time.monotonic()
+        n = 0
+        try:
+            with os.scandir(self.path) as it:
+                for entry in it:
+                    # Plain dirs and files are classified from d_type alone
+                    if entry.is_dir(follow_symlinks=False):
+                        pending_dirs.append(entry.name)
+                    elif entry.is_file(follow_symlinks=False):
+                        pending_files.append(entry.name)
+                    else:
+                        try:
+                            kind, st = self.classify(entry)
+                        except OSError:
+                            kind, st = KIND_OTHER, None
+                        special[entry.name] = kind
+                        if kind in DIR_KINDS:
+                            pending_dirs.append(entry.name)
+                        else:
+                            pending_files.append(entry.name)
+                        if st is not None:
+                            self.meta[entry.name] = (st.st_size, st.st_mtime, st.st_mode)
+                    n += 1
+                    if n & 255:
+                        continue
+                    self.scanned = n
+                    if self.cancelled.is_set():
+                        return
+                    pending = len(pending_dirs) + len(pending_files)
+                    if pending >= len(dirs) + len(files) or (
+                        time.monotonic() - last_flush > self.FLUSH_INTERVAL
+                    ):
+                        dirs = self._merge(dirs, pending_dirs)
+                        files = self._merge(files, pending_files)
+                        pending_dirs, pending_files = [], []
+                        self._publish(dirs, files, special)
+                        last_flush = time.monotonic()
+        except OSError as e:
+            self.error = e
+        self.scanned = n
+        dirs = self._merge(dirs, pending_dirs)
+        files = self._merge(files, pending_files)
+        self._publish(dirs, files, special)
+        self.loading = False
+
+    @staticmethod
+    def _merge(run, batch):
+        if not batch:
+            return run
+        # Timsort spots the two sorted runs and merges them in C
+        run = run + batch
+        run.sort()
+        return run
+
+    def _publish(self, dirs, files, special):
+        names = NameTable(dirs + files)
+        kinds = bytearray([KIND_DIR]) * len(dirs) + bytearray([KIND_FILE]) * len(files)
+        for name, kind in list(special.items()):
+            i = self.index_of(names, len(dirs), name, kind in DIR_KINDS)
+            if i is not None:
+                kinds[i] = kind
+        self.view = (names, kinds, len(dirs))
+        self.version += 1
+        self.first.set()
+        WAKER.wake()
+
+    def __len__(self):
+        return len(self.view[0])
+
+    @staticmethod
+    def index_of(names, ndirs, name, is_dir):
+        lo, hi = (0, ndirs) if is_dir else (ndirs, len(names))
+        i = bisect_left(names, name, lo, hi)
+        return i if i < hi and names[i] == name else None
+
+    def find(self, name, is_dir):
+        """Index of `name` in the current view, or None."""
+        names, _, ndirs = self.view
+        return self.index_of(names, ndirs, name, is_dir)
+
+    def find_prefix(self, prefix, start=0):
+        """First index at or after `start` whose name starts with `prefix`,
+        wrapping to the top when there is none below.
+
+        Matches form one sorted run per group (dirs, files), found with binary
+        searches; the first letter is retried with flipped case before giving up.
+        """
+        names, _, ndirs = self.view
+        for p in (prefix, prefix[:1].swapcase() + prefix[1:]):
+            runs = []
+            for lo, hi in ((0, ndirs), (ndirs, len(names))):
+                i = bisect_left(names, p, lo, hi)
+                j = bisect_left(names, p + "\U0010ffff", i, hi)
+                if i < j:
+                    runs.append((i, j))
+            for i, j in runs:
+                if start < j:
+                    return max(i, start)
+            if runs:
+                return runs[0][0]
+        return None
+
+    def stat(self, name):
+        """(size, mtime, mode) of entry `name`, or None until it is known.
+
+        Unknown entries are stat()ed on a background thread, so drawing never
+        waits on a slow or network filesystem; meta_version changes as they land.
+        """
+        meta = self.meta.get(name)
+        if meta is None:
+            with self.stat_lock:
+                self.wanted.add(name)
+                if not self.statting:
+                    self.statting = True
+                    threading.Thread(target=self._stat_worker, daemon=True).start()
+        return meta
+
+    def _stat_worker(self):
+        while True:
+            with self.stat_lock:
+                if not self.wanted or self.cancelled.is_set():
+                    self.statting = False
+                    return
+                name = self.wanted.pop()
+            if name in self.meta:
+                continue
+            try:
+                st = os.stat(os.path.join(self.path, name))
+                self.meta[name] = (st.st_size, st.st_mtime, st.st_mode)
+            except OSError:
+                self.meta[name] = (0, 0, 0)
+            self.meta_version += 1
+            WAKER.wake()
+
+
 class FileBrowser:
-    def __init__(self):
-        self.path = HOME
+    def __init__(self, path=HOME):
+        self.path = path
         self.selected = 0
         self.scroll = 0
-        self.items = []
+        self.listing = DirListing(path)
+        self.seen_version = 0
+        self.selected_name = None
         self.selected_file = None  # For preview
         self.refresh()
 
     def refresh(self):
-        try:
-            entries = os.listdir(self.path)
-            dirs = sorted(
-                [d for d in entries if os.path.isdir(os.path.join(self.path, d))]
-            )
-            files = sorted(
-                [f for f in entries if os.path.isfile(os.path.join(self.path, f))]
-            )
-            self.items = [("📁", "..", True)] if self.path != "/" else []
-            self.items += [("📂", d + "/", True) for d in dirs]
-            self.items += [("📄", f, False) for f in files]
-        except:
-            self.items = [("❌", "Permission denied", False)]
-        self.selected = min(self.selected, max(0, len(self.items) - 1))
+        self.listing.cancel()
+        self.listing = DirListing(self.path).load_async()
+        self.seen_version = 0
+        self.selected_name = None
+        self.selected = min(self.selected, max(0, self.count() - 1))
         self.selected_file = None
 
+    def sync(self):
+        """Keep the selection on the same entry as streamed batches merge in."""
+        if self.listing.version == self.seen_version:
+            return
+        self.seen_version = self.listing.version
+        if self.selected_name is not None:
+            name, is_dir = self.selected_name
+            i = self.listing.find(name, is_dir)
+            if i is not None:
+                self.selected = self.parent_row() + i
+        self.selected = min(self.selected, max(0, self.count() - 1))
+
+    def parent_row(self):
+        return 1 if self.path != "/" else 0
+
+    def count(self):
+        if self.listing.error is not None:
+            return 1
+        return self.parent_row() + len(self.listing)
+
+    def entry(self, idx):
+        """(icon, display name, kind, listing index or None) for row idx."""
+        if self.listing.error is not None:
+            return "❌", "Permission denied", None, None
+        if idx < self.parent_row():
+            return "📁", "..", KIND_DIR, None
+        names, kinds, _ = self.listing.view
+        i = idx - self.parent_row()
+        if i >= len(names):
+            return "", "", None, None
+        kind = kinds[i]
+        name = names[i] + "/" if kind in DIR_KINDS else names[i]
+        return KIND_ICONS[kind], name, kind, i
+
     def up(self):
+        self.sync()
         if self.selected > 0:
             self.selected -= 1
             self._update_selection()
 
     def down(self):
-        if self.selected < len(self.items) - 1:
+        self.sync()
+        if self.selected < self.count() - 1:
             self.selected += 1
             self._update_selection()
 
+    def jump(self, idx):
+        """Select row idx directly; rows are materialized on demand."""
+        self.sync()
+        self.selected = max(0, min(idx, self.count() - 1))
+        self._update_selection()
+
+    def jump_prefix(self, prefix):
+        """Select the next entry from the cursor down that starts with `prefix`."""
+        self.sync()
+        i = self.listing.find_prefix(prefix, max(0, self.selected - self.parent_row()))
+        if i is not None:
+            self.jump(self.parent_row() + i)
+            return True
+        return False
+
     def _update_selection(self):
-        if self.items:
-            icon, name, is_dir = self.items[self.selected]
-            if not is_dir:
-                self.selected_file = os.path.join(self.path, name)
-            else:
-                self.selected_file = None
+        icon, name, kind, i = self.entry(self.selected)
+        self.selected_name = (name.rstrip("/"), kind in DIR_KINDS) if i is not None else None
+        if kind in FILE_KINDS:
+            self.selected_file = os.path.join(self.path, name)
+        else:
+            self.selected_file = None
+
+    def selected_meta(self):
+        """Cached (size, mtime, mode) of the selected row, if it is an entry."""
+        if self.selected_name is None:
+            return None
+        return self.listing.stat(self.selected_name[0])
 
     def enter(self):
-        if not self.items:
+        self.sync()
+        if not self.count():
             return
-        icon, name, is_dir = self.items[self.selected]
-        if is_dir:
+        icon, name, kind, i = self.entry(self.selected)
+        if kind in DIR_KINDS:
             if name == "..":
                 self.path = os.path.dirname(self.path) or "/"
             else:
@@ -704,42 +2375,1543 @@ class FileBrowser:
             self.scroll = 0
             self.refresh()
             EVENTS.add(f"Dir: {self.path}")
-        else:
+        elif kind in FILE_KINDS:
             # Select file for preview
             self.selected_file = os.path.join(self.path, name)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
-# TERMINAL WITH PROC COMMAND
+# JOBS
 # ═══════════════════════════════════════════════════════════════════════════════
-class Terminal:
-    def __init__(self):
-        self.output = [
-            "╔═══════════════════════════════════════════════════╗",
-            f"║  SPECTRAL Terminal | {USER}@{HOST}                ║",
-            "║  Commands: help, proc, scan, kill <pid>, clear    ║",
-            "╚═══════════════════════════════════════════════════╝",
-            "",
+class Job:
+    """A command running in the background of the TERMINAL pane.
+
+    stdout/stderr are read line by line on reader threads and pushed onto the
+    terminal's bounded output queue, so a chatty job is throttled by pipe
+    backpressure instead of growing memory. A job can also wrap a Python
+    callable (used for slow builtins like `scan`) that returns output lines.
+    """
+
+    def __init__(self, jid, cmd, cwd, sink, func=None):
+        self.id = jid
+        self.cmd = cmd
+        self.sink = sink
+        self.state = "Running"
+        self.returncode = None
+        self.proc = None
+        if func is not None:
+            threading.Thread(target=self._run_func, args=(func,), daemon=True).start()
+            return
+        kwargs = {}
+        if IS_WINDOWS:
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["start_new_session"] = True  # Own process group for signals
+        self.proc = subprocess.Popen(
+            cmd,
+            shell=True,
+            cwd=cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env={**os.environ, "TERM": "xterm"},
+            **kwargs,
+        )
+        readers = [
+            threading.Thread(target=self._read, args=(self.proc.stdout, False), daemon=True),
+            threading.Thread(target=self._read, args=(self.proc.stderr, True), daemon=True),
         ]
-        self.cwd = os.getcwd()
-        self.history = []
-        self.hist_idx = -1
-        self.input = ""
-        self.cursor = 0
-        self.scroll = 0
-        self.should_exit = False
-
-    def prompt(self):
-        return f"{USER}@{HOST}:{self.cwd.replace(HOME, '~')}$ "
+        for t in readers:
+            t.start()
+        threading.Thread(target=self._wait, args=(readers,), daemon=True).start()
+
+    def _read(self, stream, is_err):
+        with stream:
+            for raw in stream:
+                self._put(raw.decode(errors="replace").rstrip("\r\n"), is_err)
+
+    def _wait(self, readers):
+        for t in readers:
+            t.join()
+        self._finish(self.proc.wait())
+
+    def _run_func(self, func):
+        code = 0
+        try:
+            for line in func():
+                self._put(line, False)
+        except Exception as e:
+            self._put(f"Error: {e}", True)
+            code = 1
+        self._finish(code)
+
+    def _finish(self, code):
+        self.returncode = code
+        self._put(None, code)
+
+    def _put(self, line, extra):
+        self.sink.put((self, line, extra))
+        WAKER.wake()
+
+    def signal(self, sig):
+        if self.proc is None or self.proc.poll() is not None:
+            return False
+        try:
+            if IS_WINDOWS:
+                self.proc.terminate()
+            else:
+                os.killpg(self.proc.pid, sig)
+            return True
+        except OSError:
+            return False
 
-    def execute(self, cmd):
-        if not cmd.strip():
+    def send_input(self, text):
+        if self.proc is None or self.proc.stdin is None:
             return
+        try:
+            self.proc.stdin.write(text.encode() + b"\n")
+            self.proc.stdin.flush()
+        except OSError:
+            pass
 
-        self.scroll = 0
+    def status(self):
+        if self.returncode is None:
+            return self.state
+        if self.returncode == 0:
+            return "Done"
+        if self.returncode < 0:
+            try:
+                return f"Killed ({signal.Signals(-self.returncode).name})"
+            except ValueError:
+                return f"Killed ({-self.returncode})"
+        return f"Exit {self.returncode}"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# EMBEDDED PTY
+# ═══════════════════════════════════════════════════════════════════════════════
+DEC_GRAPHICS = dict(zip("`afgjklmnopqrstuvwxyz{|}~", "◆▒°±┘┐┌└┼⎺⎻─⎼⎽├┤┴┬│≤≥π≠£·"))
+
+
+class VTScreen:
+    """A minimal VT100/xterm screen, enough for editors, pagers and top-likes.
+
+    Cells are stored as per-row lists of characters and packed attributes
+    (fg | bg << 4 | flags, colour 8 meaning "default"). Lines scrolled off the
+    top of the main screen are collected in `scrolled` so the terminal can
+    keep them as scrollback; answers to device queries go to `replies`.
+    """
+
+    DEFAULT = 0x88
+    BOLD, UNDERLINE, REVERSE = 0x100, 0x200, 0x400
+    CONTROL = re.compile(r"[\x00-\x1f\x7f-\x9f]")
+
+    def __init__(self, rows, cols):
+        self.rows, self.cols = max(1, rows), max(1, cols)
+        self.scrolled = []
+        self.replies = []
+        self.title = ""
+        self.version = 0
+        self._runs = (-1, [])
+        self.reset()
+
+    def reset(self):
+        self.attr = self.DEFAULT
+        self.cy = self.cx = 0
+        self.top, self.bottom = 0, self.rows - 1
+        self.graphics = [False, False]
+        self.shift = 0
+        self.saved = (0, 0, self.DEFAULT, [False, False], 0)
+        self.autowrap = True
+        self.insert = False
+        self.app_cursor = False
+        self.cursor_visible = True
+        self.mouse = 0  # Tracking mode the app asked for: 1000, 1002 or 1003
+        self.mouse_sgr = False
+        self.alt = None  # (chars, attrs) of the main screen while the alt one is up
+        self.state = None  # parser state; None is ground
+        self.buf = ""
+        self.chars, self.attrs = self.blank_rows(self.rows, self.DEFAULT)
+        self.version += 1
+
+    def blank_rows(self, n, attr=None):
+        attr = (self.attr & 0xF0) | 0x08 if attr is None else attr
+        return (
+            [[" "] * self.cols for _ in range(n)],
+            [[attr] * self.cols for _ in range(n)],
+        )
+
+    # ── parser ────────────────────────────────────────────────────────────
+    def feed(self, text):
+        i, n = 0, len(text)
+        while i < n:
+            if self.state is None:
+                m = self.CONTROL.search(text, i)
+                j = m.start() if m else n
+                if j > i:
+                    self.put(text[i:j])
+                if m is None:
+                    break
+                self.control(text[j])
+                i = j + 1
+            else:
+                self.escape(text[i])
+                i += 1
+        self.version += 1
+
+    def control(self, ch):
+        if ch == "\x1b":
+            self.state = "esc"
+        elif ch == "\r":
+            self.cx = 0
+        elif ch in "\n\x0b\x0c":
+            self.linefeed()
+        elif ch == "\x08":
+            self.cx = max(0, min(self.cx, self.cols - 1) - 1)
+        elif ch == "\t":
+            self.cx = min(self.cols - 1, (self.cx // 8 + 1) * 8)
+        elif ch == "\x0e":
+            self.shift = 1
+        elif ch == "\x0f":
+            self.shift = 0
+
+    def escape(self, ch):
+        state = self.state
+        if state == "esc":
+            self.state = None
+            if ch == "[":
+                self.state, self.buf = "csi", ""
+            elif ch == "]":
+                self.state, self.buf = "osc", ""
+            elif ch in "P^_X":
+                self.state = "str"
+            elif ch in "()":
+                self.state = "g" + str("()".index(ch))
+            elif ch in "*+#% ":
+                self.state = "skip"
+            elif ch == "7":
+                self.save_cursor()
+            elif ch == "8":
+                self.restore_cursor()
+            elif ch == "D":
+                self.linefeed()
+            elif ch == "E":
+                self.cx = 0
+                self.linefeed()
+            elif ch == "M":
+                self.reverse_index()
+            elif ch == "c":
+                self.reset()
+        elif state == "csi":
+            if " " <= ch <= "?":
+                self.buf += ch
+                if len(self.buf) > 64:
+                    self.state = None
+            elif "@" <= ch <= "~":
+                self.state = None
+                self.csi(ch)
+            else:
+                self.state = None
+                self.control(ch)
+        elif state == "osc":
+            if ch == "\x07" or ch == "\x1b":
+                self.state = "esc" if ch == "\x1b" else None
+                code, _, arg = self.buf.partition(";")
+                if code in ("0", "2"):
+                    self.title = arg
+            elif len(self.buf) < 4096:
+                self.buf += ch
+        elif state == "str":
+            if ch == "\x1b":
+                self.state = "esc"
+            elif ch == "\x07":
+                self.state = None
+        elif state in ("g0", "g1"):
+            self.graphics[int(state[1])] = ch == "0"
+            self.state = None
+        else:
+            self.state = None
+
+    # ── output ────────────────────────────────────────────────────────────
+    def put(self, text):
+        if self.graphics[self.shift]:
+            text = "".join(DEC_GRAPHICS.get(c, c) for c in text)
+        cols = self.cols
+        while text:
+            if self.cx >= cols:
+                if self.autowrap:
+                    self.cx = 0
+                    self.linefeed()
+                else:
+                    self.cx = cols - 1
+            chars, attrs, cx = self.chars[self.cy], self.attrs[self.cy], self.cx
+            if self.insert:
+                chars.insert(cx, text[0])
+                attrs.insert(cx, self.attr)
+                del chars[cols:], attrs[cols:]
+                self.cx += 1
+                text = text[1:]
+                continue
+            k = min(len(text), cols - cx)
+            chars[cx : cx + k] = text[:k]
+            attrs[cx : cx + k] = [self.attr] * k
+            self.cx += k
+            text = text[k:]
+
+    def linefeed(self):
+        if self.cy == self.bottom:
+            self.scroll_up(1)
+        elif self.cy < self.rows - 1:
+            self.cy += 1
+
+    def reverse_index(self):
+        if self.cy == self.top:
+            self.scroll_down(1)
+        elif self.cy > 0:
+            self.cy -= 1
+
+    def scroll_up(self, n, at=None):
+        top = self.top if at is None else at
+        n = min(n, self.bottom - top + 1)
+        if at is None and top == 0 and self.alt is None:
+            self.scrolled.extend("".join(row).rstrip() for row in self.chars[:n])
+        del self.chars[top : top + n], self.attrs[top : top + n]
+        chars, attrs = self.blank_rows(n)
+        pos = self.bottom - n + 1
+        self.chars[pos:pos] = chars
+        self.attrs[pos:pos] = attrs
+
+    def scroll_down(self, n, at=None):
+        top = self.top if at is None else at
+        n = min(n, self.bottom - top + 1)
+        pos = self.bottom - n + 1
+        del self.chars[pos : self.bottom + 1], self.attrs[pos : self.bottom + 1]
+        chars, attrs = self.blank_rows(n)
+        self.chars[top:top] = chars
+        self.attrs[top:top] = attrs
+
+    def erase(self, row, start, end):
+        end = min(end, self.cols)
+        if start < end:
+            self.chars[row][start:end] = [" "] * (end - start)
+            self.attrs[row][start:end] = [(self.attr & 0xF0) | 0x08] * (end - start)
+
+    def save_cursor(self):
+        self.saved = (self.cy, self.cx, self.attr, list(self.graphics), self.shift)
+
+    def restore_cursor(self):
+        cy, cx, self.attr, graphics, self.shift = self.saved
+        self.graphics = list(graphics)
+        self.cy, self.cx = min(cy, self.rows - 1), min(cx, self.cols - 1)
+
+    def set_alt(self, on, save):
+        if on and self.alt is None:
+            if save:
+                self.save_cursor()
+            self.alt = (self.chars, self.attrs)
+            self.chars, self.attrs = self.blank_rows(self.rows, self.DEFAULT)
+        elif not on and self.alt is not None:
+            self.chars, self.attrs = self.alt
+            self.alt = None
+            if save:
+                self.restore_cursor()
+
+    # ── control sequences ─────────────────────────────────────────────────
+    def csi(self, final):
+        buf = self.buf
+        private = buf[0] if buf and buf[0] in "<=>?" else ""
+        if private:
+            buf = buf[1:]
+        if buf.strip("0123456789;:"):
+            return  # Intermediate bytes: nothing we emulate
+        params = [int(p.split(":")[0] or 0) for p in buf.split(";")] if buf else []
+        p0 = params[0] if params else 0
+        n = p0 or 1
+        rows, cols = self.rows, self.cols
+        cy, cx = self.cy, min(self.cx, cols - 1)
+
+        if final == "m":
+            if not private:
+                self.sgr(params or [0])
+        elif final in "Hf":
+            col = params[1] if len(params) > 1 else 1
+            self.cy = min(rows - 1, max(0, n - 1))
+            self.cx = min(cols - 1, max(0, (col or 1) - 1))
+        elif final == "A":
+            self.cy = max(self.top if cy >= self.top else 0, cy - n)
+            self.cx = cx
+        elif final in "Be":
+            self.cy = min(self.bottom if cy <= self.bottom else rows - 1, cy + n)
+            self.cx = cx
+        elif final in "Ca":
+            self.cx = min(cols - 1, cx + n)
+        elif final == "D":
+            self.cx = max(0, cx - n)
+        elif final == "E":
+            self.cy, self.cx = min(self.bottom, cy + n), 0
+        elif final == "F":
+            self.cy, self.cx = max(self.top, cy - n), 0
+        elif final in "G`":
+            self.cx = min(cols - 1, n - 1)
+        elif final == "d":
+            self.cy = min(rows - 1, n - 1)
+        elif final == "J":
+            if p0 == 0:
+                self.erase(cy, cx, cols)
+                for r in range(cy + 1, rows):
+                    self.erase(r, 0, cols)
+            elif p0 == 1:
+                for r in range(cy):
+                    self.erase(r, 0, cols)
+                self.erase(cy, 0, cx + 1)
+            else:
+                for r in range(rows):
+                    self.erase(r, 0, cols)
+        elif final == "K":
+            if p0 == 0:
+                self.erase(cy, cx, cols)
+            elif p0 == 1:
+                self.erase(cy, 0, cx + 1)
+            else:
+                self.erase(cy, 0, cols)
+        elif final == "X":
+            self.erase(cy, cx, cx + n)
+        elif final == "@":
+            chars, attrs = self.blank_rows(1)
+            self.chars[cy][cx:cx] = chars[0][:n]
+            self.attrs[cy][cx:cx] = attrs[0][:n]
+            del self.chars[cy][cols:], self.attrs[cy][cols:]
+        elif final == "P":
+            n = min(n, cols - cx)
+            del self.chars[cy][cx : cx + n], self.attrs[cy][cx : cx + n]
+            chars, attrs = self.blank_rows(1)
+            self.chars[cy].extend(chars[0][:n])
+            self.attrs[cy].extend(attrs[0][:n])
+        elif final == "L":
+            if self.top <= cy <= self.bottom:
+                self.scroll_down(n, at=cy)
+                self.cx = 0
+        elif final == "M":
+            if self.top <= cy <= self.bottom:
+                self.scroll_up(n, at=cy)
+                self.cx = 0
+        elif final == "S" and not private:
+            self.scroll_up(n)
+        elif final == "T" and not private and len(params) <= 1:
+            self.scroll_down(n)
+        elif final == "r" and not private:
+            bottom = params[1] if len(params) > 1 and params[1] else rows
+            if n - 1 < bottom - 1 <= rows - 1:
+                self.top, self.bottom = n - 1, bottom - 1
+                self.cy = self.cx = 0
+        elif final == "s" and not private:
+            self.save_cursor()
+        elif final == "u" and not private:
+            self.restore_cursor()
+        elif final in "hl":
+            self.set_modes(private, params, final == "h")
+        elif final == "n" and not private:
+            if p0 == 5:
+                self.replies.append("\x1b[0n")
+            elif p0 == 6:
+                self.replies.append(f"\x1b[{cy + 1};{cx + 1}R")
+        elif final == "c":
+            if not private:
+                self.replies.append("\x1b[?1;2c")
+            elif private == ">":
+                self.replies.append("\x1b[>0;95;0c")
+
+    def set_modes(self, private, params, on):
+        for p in params:
+            if private == "?":
+                if p == 1:
+                    self.app_cursor = on
+                elif p == 7:
+                    self.autowrap = on
+                elif p == 25:
+                    self.cursor_visible = on
+                elif p in (47, 1047, 1049):
+                    self.set_alt(on, save=(p == 1049))
+                elif p in (1000, 1002, 1003):
+                    self.mouse = p if on else 0
+                elif p == 1006:
+                    self.mouse_sgr = on
+            elif not private and p == 4:
+                self.insert = on
+
+    def sgr(self, params):
+        fg, bg, flags = self.attr & 0xF, (self.attr >> 4) & 0xF, self.attr & 0xF00
+        i = 0
+        while i < len(params):
+            p = params[i]
+            i += 1
+            if p == 0:
+                fg, bg, flags = 8, 8, 0
+            elif p == 1:
+                flags |= self.BOLD
+            elif p == 4:
+                flags |= self.UNDERLINE
+            elif p == 7:
+                flags |= self.REVERSE
+            elif p in (21, 22):
+                flags &= ~self.BOLD
+            elif p == 24:
+                flags &= ~self.UNDERLINE
+            elif p == 27:
+                flags &= ~self.REVERSE
+            elif 30 <= p <= 37:
+                fg = p - 30
+            elif p == 39:
+                fg = 8
+            elif 40 <= p <= 47:
+                bg = p - 40
+            elif p == 49:
+                bg = 8
+            elif 90 <= p <= 97:
+                fg, flags = p - 90, flags | self.BOLD
+            elif 100 <= p <= 107:
+                bg = p - 100
+            elif p in (38, 48) and i < len(params):
+                if params[i] == 5 and i + 1 < len(params):
+                    color, i = self.color256(params[i + 1]), i + 2
+                elif params[i] == 2 and i + 3 < len(params):
+                    r, g, b = params[i + 1 : i + 4]
+                    color, i = (r > 127) | (g > 127) << 1 | (b > 127) << 2, i + 4
+                else:
+                    break
+                if p == 38:
+                    fg = color
+                else:
+                    bg = color
+        self.attr = fg | bg << 4 | flags
+
+    @staticmethod
+    def color256(n):
+        """Fold an xterm 256-colour index onto the 8 basic colours."""
+        if n < 16:
+            return n % 8
+        if n < 232:
+            n -= 16
+            return (n // 36 > 2) | (n // 6 % 6 > 2) << 1 | (n % 6 > 2) << 2
+        return 7 if n >= 244 else 0
+
+    # ── geometry / rendering ──────────────────────────────────────────────
+    def resize(self, rows, cols):
+        rows, cols = max(1, rows), max(1, cols)
+        if (rows, cols) == (self.rows, self.cols):
+            return
+        self.cols = cols
+        buffers = [(self.chars, self.attrs)]
+        if self.alt is not None:
+            buffers.append(self.alt)
+        for chars, attrs in buffers:
+            for row in chars:
+                del row[cols:]
+                row.extend(" " * (cols - len(row)))
+            for row in attrs:
+                del row[cols:]
+                row.extend([self.DEFAULT] * (cols - len(row)))
+        # Keep the cursor row on screen, pushing lines above it into scrollback
+        drop = max(0, self.cy - rows + 1)
+        if drop:
+            if self.alt is None:
+                self.scrolled.extend("".join(row).rstrip() for row in self.chars[:drop])
+            del self.chars[:drop], self.attrs[:drop]
+            self.cy -= drop
+        self.rows = rows
+        for chars, attrs in buffers:
+            del chars[rows:], attrs[rows:]
+            blank_chars, blank_attrs = self.blank_rows(rows - len(chars), self.DEFAULT)
+            chars.extend(blank_chars)
+            attrs.extend(blank_attrs)
+        self.top, self.bottom = 0, rows - 1
+        self.cy, self.cx = min(self.cy, rows - 1), min(self.cx, cols - 1)
+        self.version += 1
+
+    def text_lines(self):
+        """The main screen as text, without trailing blank rows."""
+        chars = self.alt[0] if self.alt is not None else self.chars
+        lines = ["".join(row).rstrip() for row in chars]
+        while lines and not lines[-1]:
+            lines.pop()
+        return lines
+
+    def runs(self):
+        """Per row, a list of (col, text, attr) runs; cached per version."""
+        if self._runs[0] != self.version:
+            out = []
+            for chars, attrs in zip(self.chars, self.attrs):
+                row, start = [], 0
+                for i in range(1, self.cols + 1):
+                    if i == self.cols or attrs[i] != attrs[start]:
+                        text = "".join(chars[start:i])
+                        if attrs[start] != self.DEFAULT or text.strip():
+                            row.append((start, text, attrs[start]))
+                        start = i
+                out.append(row)
+            self._runs = (self.version, out)
+        return self._runs[1]
+
+
+class PtySession:
+    """An interactive program running on a pseudo-terminal in the TERMINAL pane.
+
+    Output is read without blocking once per frame and fed to a VTScreen, so
+    full-screen tools render inside the pane while the dashboard keeps running.
+    """
+
+    KEYS = None  # curses key code -> sequence, built on the first keypress
+
+    @classmethod
+    def key_map(cls):
+        if cls.KEYS is not None:
+            return cls.KEYS
+        keys = {
+            curses.KEY_UP: ("\x1b[A", "\x1bOA"),
+            curses.KEY_DOWN: ("\x1b[B", "\x1bOB"),
+            curses.KEY_RIGHT: ("\x1b[C", "\x1bOC"),
+            curses.KEY_LEFT: ("\x1b[D", "\x1bOD"),
+            curses.KEY_HOME: ("\x1b[H", "\x1bOH"),
+            curses.KEY_END: ("\x1b[F", "\x1bOF"),
+            curses.KEY_IC: "\x1b[2~",
+            curses.KEY_DC: "\x1b[3~",
+            curses.KEY_PPAGE: "\x1b[5~",
+            curses.KEY_NPAGE: "\x1b[6~",
+            curses.KEY_BTAB: "\x1b[Z",
+            curses.KEY_BACKSPACE: "\x7f",
+            curses.KEY_ENTER: "\r",
+            10: "\r",
+            13: "\r",
+        }
+        keys.update(
+            (curses.KEY_F0 + i, seq)
+            for i, seq in enumerate(
+                ["\x1bOP", "\x1bOQ", "\x1bOR", "\x1bOS"]
+                + [f"\x1b[{n}~" for n in (15, 17, 18, 19, 20, 21, 23, 24)],
+                start=1,
+            )
+        )
+        cls.KEYS = keys
+        return keys
+
+    def __init__(self, cmd, cwd, rows, cols):
+        import fcntl
+        import pty
+        import shlex
+        import termios
+
+        self.cmd = cmd
+        self.screen = VTScreen(rows, cols)
+        self.returncode = None
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._ioctl = lambda fd, r, c: fcntl.ioctl(
+            fd, termios.TIOCSWINSZ, struct.pack("HHHH", r, c, 0, 0)
+        )
+        env = {**os.environ, "TERM": "xterm", "LINES": str(rows), "COLUMNS": str(cols)}
+        # Exec simple commands directly so the app, not sh, owns the tty signals
+        argv = ["/bin/sh", "-c", cmd]
+        if not re.search(r"[|&;<>()$`*?\[\]{}~\\\"']", cmd):
+            argv = shlex.split(cmd) or argv
+        self.pid, self.fd = pty.fork()
+        if self.pid == 0:  # Child: size the tty before exec so the app sees it
+            try:
+                self._ioctl(0, rows, cols)
+                os.chdir(cwd)
+                os.execvpe(argv[0], argv, env)
+            except OSError as e:
+                os.write(2, f"{argv[0]}: {e.strerror}\n".encode())
+            finally:
+                os._exit(127)
+        os.set_blocking(self.fd, False)
+
+    @property
+    def alive(self):
+        return self.returncode is None
+
+    def pump(self, budget=65536):
+        """Feed pending output to the screen; returns True if it changed."""
+        if not self.alive:
+            return False
+        got = self._read(budget)
+        if self.screen.replies:
+            self.write("".join(self.screen.replies).encode())
+            self.screen.replies.clear()
+        if got < budget:
+            self._reap()
+        return got > 0
+
+    def _read(self, budget):
+        got = 0
+        while got < budget:
+            try:
+                data = os.read(self.fd, 16384)
+            except OSError:
+                break  # EAGAIN: nothing pending; EIO: every slave fd is closed
+            if not data:
+                break
+            got += len(data)
+            self.screen.feed(self.decoder.decode(data))
+        return got
+
+    def _reap(self):
+        try:
+            pid, status = os.waitpid(self.pid, os.WNOHANG | os.WUNTRACED)
+        except ChildProcessError:
+            pid, status = self.pid, 0
+        if pid and os.WIFSTOPPED(status):
+            os.killpg(self.pid, signal.SIGCONT)  # No shell to resume a ^Z'd app
+        elif pid:
+            self._read(1 << 20)  # Whatever the child wrote just before exiting
+            self.returncode = os.waitstatus_to_exitcode(status)
+            os.close(self.fd)
+
+    def write(self, data):
+        if not self.alive:
+            return
+        try:
+            os.write(self.fd, data)
+        except OSError:
+            pass
+
+    def send_mouse(self, col, row, button, release=False, motion=False):
+        """Report a mouse event at a 0-based cell, in the app's chosen encoding.
+
+        button is 0-2 for left/middle/right, 3 for none (motion only) and
+        64/65 for the wheel.
+        """
+        mode = self.screen.mouse
+        if not mode or (motion and (mode == 1000 or (mode == 1002 and button == 3))):
+            return
+        code = button + (32 if motion else 0)
+        if self.screen.mouse_sgr:
+            seq = f"\x1b[<{code};{col + 1};{row + 1}{'m' if release else 'M'}"
+        else:
+            if release:
+                code = 3
+            cells = (code, col + 1, row + 1)
+            seq = "\x1b[M" + "".join(chr(32 + min(v, 223)) for v in cells)
+        self.write(seq.encode("latin-1"))
+
+    def send_key(self, key):
+        seq = self.key_map().get(key)
+        if isinstance(seq, tuple):
+            seq = seq[self.screen.app_cursor]
+        if seq is not None:
+            self.write(seq.encode())
+        elif 0 <= key < 256:
+            self.write(bytes([key]))
+
+    def resize(self, rows, cols):
+        if (rows, cols) == (self.screen.rows, self.screen.cols) or not self.alive:
+            return
+        self.screen.resize(rows, cols)
+        try:
+            self._ioctl(self.fd, rows, cols)  # Kernel sends SIGWINCH to the app
+        except OSError:
+            pass
+
+    def close(self):
+        if self.alive:
+            try:
+                os.killpg(self.pid, signal.SIGHUP)
+            except OSError:
+                pass
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCROLLBACK
+# ═══════════════════════════════════════════════════════════════════════════════
+class Scrollback:
+    """Terminal scrollback: an append-only ring of lines kept in chunks.
+
+    Lines are addressed by absolute number (`first` .. `end`), which never
+    goes backwards, so readers can remember positions across trims. The
+    newest `hot` chunks stay as plain lists; older ones are zlib-compressed
+    and, with `spill`, written to an anonymous temp file. Appending is O(1)
+    and drawing the last screenful only touches the newest chunk.
+    """
+
+    CHUNK = 1024
+    SPILL_SLACK = 1 << 16  # Spill file bytes tolerated before compacting
+
+    def __init__(self, limit=100000, hot=4, spill=False):
+        self.limit = max(self.CHUNK, limit)
+        self.hot = max(1, hot)
+        self.spill = spill
+        self.chunks = deque([[]])
+        self.base = 0  # Absolute number of chunks[0][0]
+        self.first = 0  # Oldest retained line
+        self.end = 0  # One past the newest line
+        self.cache = OrderedDict()  # Recently unpacked chunks by base line
+        self.file = None
+        self.file_end = 0
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return self.end - self.first
+
+    def __getitem__(self, key):
+        n = self.end - self.first
+        if isinstance(key, slice):
+            start, stop, _ = key.indices(n)
+            return self.lines(self.first + start, self.first + stop)
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError("scrollback index out of range")
+        return self.lines(self.first + key, self.first + key + 1)[0]
+
+    def append(self, line):
+        if "\n" in line:
+            return self.extend(line.split("\n"))
+        with self.lock:
+            tail = self.chunks[-1]
+            tail.append(line)
+            self.end += 1
+            if len(tail) == self.CHUNK:
+                self.chunks.append([])
+                if len(self.chunks) > self.hot + 1:
+                    self.chunks[-self.hot - 2] = self._pack(self.chunks[-self.hot - 2])
+            if self.end - self.first > self.limit:
+                self._trim(self.end - self.limit)
+
+    def extend(self, lines):
+        for line in lines:
+            self.append(line)
+
+    def clear(self):
+        with self.lock:
+            self._trim(self.end)
+
+    def lines(self, start, stop):
+        """Lines with absolute numbers in [start, stop)."""
+        with self.lock:
+            start, stop = max(start, self.first), min(stop, self.end)
+            out = []
+            while start < stop:
+                ci, off = divmod(start - self.base, self.CHUNK)
+                part = self._chunk(ci)[off : off + stop - start]
+                out.extend(part)
+                start += len(part)
+            return out
+
+    def stats(self):
+        with self.lock:
+            packed = sum(1 for c in self.chunks if not isinstance(c, list))
+            return {
+                "lines": len(self),
+                "chunks": len(self.chunks),
+                "packed": packed,
+                "spilled": self.file_end,
+                "spilled_live": sum(c[1] for c in self.chunks if isinstance(c, tuple)),
+            }
+
+    def _pack(self, lines):
+        data = zlib.compress("\n".join(lines).encode("utf-8", "surrogateescape"), 1)
+        if not self.spill:
+            return data
+        try:
+            if self.file is None:
+                import tempfile
+
+                self.file = tempfile.TemporaryFile(prefix="spectral-")
+            os.pwrite(self.file.fileno(), data, self.file_end)
+            self.file_end += len(data)
+            return (self.file_end - len(data), len(data))
+        except OSError:
+            return data
+
+    def _chunk(self, ci):
+        chunk = self.chunks[ci]
+        if isinstance(chunk, list):
+            return chunk
+        key = self.base + ci * self.CHUNK
+        lines = self.cache.get(key)
+        if lines is None:
+            if isinstance(chunk, tuple):
+                chunk = os.pread(self.file.fileno(), chunk[1], chunk[0])
+            lines = zlib.decompress(chunk).decode("utf-8", "surrogateescape").split("\n")
+            self.cache[key] = lines
+            if len(self.cache) > 4:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(key)
+        return lines
+
+    def _trim(self, first):
+        self.first = max(self.first, first)
+        while len(self.chunks) > 1 and self.base + self.CHUNK <= self.first:
+            self.chunks.popleft()
+            self.cache.pop(self.base, None)
+            self.base += self.CHUNK
+        if self.first == self.end:
+            # Empty: restart the ring (and spill file) at the current position
+            self.chunks = deque([[]])
+            self.base = self.end
+            self.cache.clear()
+            if self.file is not None:
+                self.file.truncate(0)
+                self.file_end = 0
+        elif self.file is not None:
+            self._compact()
+
+    def _compact(self):
+        """Slide live spilled chunks to the front once most of the file is dead.
+
+        Chunks sit in the file in ring order, so each one moves to an offset
+        at or below its old one and the rewrite never clobbers a later chunk.
+        Runs when dead bytes exceed both the live ones and SPILL_SLACK, so
+        the file stays under twice the live size (plus slack) at amortized
+        O(1) cost per spilled byte.
+        """
+        spilled = [i for i, c in enumerate(self.chunks) if isinstance(c, tuple)]
+        live = sum(self.chunks[i][1] for i in spilled)
+        if self.file_end - live <= max(live, self.SPILL_SLACK):
+            return
+        fd, end = self.file.fileno(), 0
+        try:
+            for i in spilled:
+                offset, size = self.chunks[i]
+                if offset != end:
+                    os.pwrite(fd, os.pread(fd, size, offset), end)
+                    self.chunks[i] = (end, size)
+                end += size
+            self.file.truncate(end)
+            self.file_end = end
+        except OSError:
+            pass
+
+
+class ScrollbackSearch:
+    """Incremental plain/regex search over a Scrollback.
+
+    Each pattern keeps a sorted array of matching line numbers and how far
+    it has scanned, so repeating a search, or searching again after more
+    output arrived, only scans the new lines. Scanning happens on a
+    background thread in batches; `poke()` it after appending output.
+    """
+
+    BATCH = 4096
+
+    def __init__(self, scrollback, keep=8):
+        self.scrollback = scrollback
+        self.keep = keep
+        self.indexes = OrderedDict()  # (text, regex) -> index dict, LRU
+        self.current = None
+        self.wake = threading.Event()
+        self.thread = None
+
+    def search(self, text, regex=False):
+        """Make a pattern the active one; raises re.error for a bad regex."""
+        key = (text, regex)
+        index = self.indexes.get(key)
+        if index is None:
+            flags = 0 if any(c.isupper() for c in text) else re.IGNORECASE
+            pattern = re.compile(text if regex else re.escape(text), flags)
+            index = {"pattern": pattern, "hits": array("Q"), "scanned": 0}
+            self.indexes[key] = index
+            if len(self.indexes) > self.keep:
+                self.indexes.popitem(last=False)
+        else:
+            self.indexes.move_to_end(key)
+            hits = index["hits"]
+            del hits[: bisect_left(hits, self.scrollback.first)]
+        self.current = index
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        self.wake.set()
+        return index
+
+    def stop(self):
+        self.current = None
+
+    def poke(self):
+        if self.current is not None:
+            self.wake.set()
+
+    def _run(self):
+        sb = self.scrollback
+        while True:
+            self.wake.wait()
+            self.wake.clear()
+            while True:
+                index = self.current
+                if index is None:
+                    break
+                start = max(index["scanned"], sb.first)
+                stop = min(sb.end, start + self.BATCH)
+                if start >= stop:
+                    break
+                search = index["pattern"].search
+                lines = sb.lines(start, stop)
+                found = [start + i for i, line in enumerate(lines) if search(line)]
+                index["hits"].extend(found)
+                index["scanned"] = start + len(lines)
+                WAKER.wake()
+
+    # ── queries on the active pattern ──────────────────────────────────────
+    def hits(self):
+        """(sorted hit array, offset of the first hit still in the scrollback)."""
+        hits = self.current["hits"] if self.current else array("Q")
+        return hits, bisect_left(hits, self.scrollback.first)
+
+    def neighbor(self, line, step):
+        """The hit before (step < 0) or after (step > 0) absolute `line`."""
+        hits, lo = self.hits()
+        if step < 0:
+            i = bisect_left(hits, line, lo) - 1
+            return hits[i] if i >= lo else None
+        i = bisect_right(hits, line, lo)
+        return hits[i] if i < len(hits) else None
+
+    def progress(self, line=None):
+        """(rank of `line` among hits or 0, hit count, scan finished)."""
+        hits, lo = self.hits()
+        rank = bisect_left(hits, line, lo) - lo + 1 if line is not None else 0
+        done = self.current is not None and self.current["scanned"] >= self.scrollback.end
+        return rank, len(hits) - lo, done
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COMMAND HISTORY
+# ═══════════════════════════════════════════════════════════════════════════════
+class History:
+    """Terminal command history, persisted to an append-only file.
+
+    Entries live oldest-first in a list addressed by position; re-running a
+    command tombstones its older copy so each command appears once. The file
+    only ever grows by appends and is rewritten (deduplicated and capped)
+    once it carries too much garbage. Reverse search uses a per-character
+    index of positions and narrows the previous candidates as the query
+    grows, instead of rescanning every entry on each keystroke.
+    """
+
+    def __init__(self, path=HISTORY_FILE, cap=100000):
+        self.path = path
+        self.cap = max(100, cap)
+        self.entries = []  # Filled by _load; readers use whatever is there so far
+        self.pending = []  # Commands added while a background pass owns the file
+        self.where = {}  # command -> position of its live copy
+        self.chars = None  # char -> array of positions, built in the background
+        self.found = {}  # query -> candidate positions, for the current search
+        self.lock = threading.Lock()
+        self.started = False
+        self.loaded = False
+        self.rewriting = False  # A background compaction owns the file
+
+    def _load(self):
+        """Read the file on the preload thread; callers see the entries so far."""
+        lines = 0
+        try:
+            with open(self.path, encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    lines += 1
+                    self._add(line.rstrip("\n"))
+        except OSError:
+            pass
+        if len(self.where) > self.cap or lines > len(self.where) * 5 // 4 + 100:
+            self._compact()
+        with self.lock:
+            self._flush_pending()
+            self.loaded = True
+        self._index()
+
+    def _rewrite(self):
+        """Compact after add() overflowed the cap, off the UI thread."""
+        self._compact()
+        with self.lock:
+            self._flush_pending()
+            self.rewriting = False
+        self._index()
+
+    def _flush_pending(self):
+        # Called with the lock held, once the file is ours to append to again
+        for cmd in self.pending:
+            self._append(cmd)
+        self._save(self.pending)
+        self.pending = []
+
+    def preload(self):
+        """Start loading the file in the background; later calls do nothing."""
+        with self.lock:
+            if self.started:
+                return
+            self.started = True
+        threading.Thread(target=self._load, daemon=True).start()
+
+    def _add(self, cmd):
+        with self.lock:
+            self._append(cmd)
+
+    def _append(self, cmd):
+        old = self.where.get(cmd)
+        if old is not None:
+            self.entries[old] = None
+        pos = len(self.entries)
+        self.where[cmd] = pos
+        self.entries.append(cmd)
+        if self.chars is not None:
+            for c in set(cmd):
+                self.chars.setdefault(c, array("I")).append(pos)
+
+    def _index(self):
+        chars, done = {}, 0
+        entries = self.entries
+        while True:
+            with self.lock:
+                if self.entries is not entries:
+                    return  # Compacted meanwhile; a fresh pass takes over
+                stop = len(entries)
+                if done >= stop:
+                    self.chars = chars  # _add keeps it current from here on
+                    return
+            for pos in range(done, stop):
+                cmd = entries[pos]
+                if cmd is not None:
+                    for c in set(cmd):
+                        chars.setdefault(c, array("I")).append(pos)
+            done = stop
+
+    def _compact(self):
+        live = [cmd for cmd in self.entries if cmd is not None][-self.cap :]
+        with self.lock:
+            self.entries = live
+            self.where = {cmd: pos for pos, cmd in enumerate(live)}
+            self.chars = None
+        self.found.clear()
+        try:
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with self._open(tmp, os.O_TRUNC) as f:
+                f.writelines(cmd + "\n" for cmd in live)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def _save(self, cmds):
+        if not cmds:
+            return
+        try:
+            with self._open(self.path, os.O_APPEND) as f:
+                f.writelines(cmd + "\n" for cmd in cmds)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _open(path, flag):
+        # Shell history can hold secrets: private to the user, whatever the umask
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | flag, 0o600)
+        return os.fdopen(fd, "w", encoding="utf-8")
+
+    def add(self, cmd):
+        cmd = cmd.replace("\n", " ")
+        if not cmd.strip():
+            return
+        self.preload()
+        with self.lock:
+            if not self.loaded or self.rewriting:
+                self.pending.append(cmd)  # Added and saved when that pass ends
+                return
+            self._append(cmd)
+            overflow = len(self.entries) > self.cap * 5 // 4
+            self.rewriting = overflow
+        self.found.clear()
+        self._save([cmd])
+        if overflow:
+            threading.Thread(target=self._rewrite, daemon=True).start()
+
+    # ── navigation ────────────────────────────────────────────────────────
+    def older(self, pos=None):
+        """(position, command) of the live entry before `pos` (None: newest)."""
+        self.preload()
+        entries = self.entries
+        pos = len(entries) if pos is None else min(pos, len(entries))
+        for p in range(pos - 1, -1, -1):
+            if entries[p] is not None:
+                return p, entries[p]
+        return None
+
+    def newer(self, pos):
+        self.preload()
+        entries = self.entries
+        for p in range(pos + 1, len(entries)):
+            if entries[p] is not None:
+                return p, entries[p]
+        return None
+
+    def search(self, query, before=None):
+        """(position, command) of the newest entry containing `query`."""
+        self.preload()
+        if not query:
+            return None
+        entries = self.entries  # _load may swap in a compacted list meanwhile
+        cand = self.found.get(query)
+        if cand is None:
+            prev = self.found.get(query[:-1])
+            if prev is None:
+                if self.chars is not None:
+                    with self.lock:
+                        prev = min((self.chars.get(c, ()) for c in set(query)), key=len)
+                        prev = list(prev)
+                else:
+                    prev = range(len(entries))
+            cand = [p for p in prev if entries[p] is not None and query in entries[p]]
+            if self.loaded and not self.rewriting:
+                self.found[query] = cand  # Lists still changing are searched afresh
+        i = bisect_left(cand, len(entries) if before is None else before) - 1
+        return (cand[i], entries[cand[i]]) if i >= 0 else None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COMPLETION
+# ═══════════════════════════════════════════════════════════════════════════════
+BUILTINS = (
+    "about",
+    "bg",
+    "cd",
+    "clear",
+    "exit",
+    "fg",
+    "help",
+    "jobs",
+    "kill",
+    "proc",
+    "quit",
+    "scan",
+)
+# Words after which the next word is a command again
+COMMAND_POSITION = ("|", "||", "&&", ";", "&", "sudo", "doas", "time", "watch", "nohup")
+
+
+class Completer:
+    """Tab completion for the terminal: builtins, $PATH commands and paths.
+
+    The command index maps each $PATH directory to its executables and is
+    rebuilt on a background thread, re-listing only directories whose mtime
+    changed (checked at most once a second). Lookups bisect the merged,
+    sorted name list, so a Tab never waits on the filesystem for commands.
+    Path completion caches a few directory listings keyed on mtime; those are
+    also scanned in the background, and a Tab waits at most LISTING_WAIT for
+    one before completing from what has been listed so far.
+    """
+
+    LISTING_WAIT = 0.02  # About a frame
+    PARTIAL_EVERY = 0.1  # Seconds between partial listings of a big directory
+
+    def __init__(self):
+        self.dirs = {}  # $PATH dir -> (mtime_ns, executable names)
+        self.commands = sorted(BUILTINS)
+        self.checked = 0
+        self.busy = False
+        # dir -> (mtime_ns or None while partial, sorted names, subdirs, checked)
+        self.listings = OrderedDict()
+        self.scanning = {}  # dir -> listing thread
+        self.lock = threading.Lock()
+
+    def refresh(self, force=False):
+        now = time.time()
+        if self.busy or (not force and now - self.checked < 1):
+            return
+        self.checked = now
+        self.busy = True
+        threading.Thread(target=self._scan, daemon=True).start()
 
-        self.history.append(cmd)
-        self.hist_idx = -1
+    def _scan(self):
+        try:
+            dirs = {}
+            for d in os.environ.get("PATH", "").split(os.pathsep):
+                if not d or d in dirs:
+                    continue
+                try:
+                    mtime = os.stat(d).st_mtime_ns
+                except OSError:
+                    continue
+                old = self.dirs.get(d)
+                dirs[d] = old if old and old[0] == mtime else (mtime, self._executables(d))
+            if dirs != self.dirs:
+                names = set(BUILTINS)
+                for _, found in dirs.values():
+                    names.update(found)
+                self.commands = sorted(names)
+                self.dirs = dirs
+        finally:
+            self.busy = False
+
+    @staticmethod
+    def _executables(d):
+        names = []
+        try:
+            with os.scandir(d) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file() and os.access(entry.path, os.X_OK):
+                            names.append(entry.name)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+        return names
+
+    @staticmethod
+    def _prefixed(names, prefix):
+        lo = bisect_left(names, prefix)
+        return names[lo : bisect_left(names, prefix + "\U0010ffff", lo)]
+
+    def listing(self, d):
+        """(sorted names, subdirs) of `d`; possibly partial or a second stale."""
+        with self.lock:
+            cached = self.listings.get(d)
+        if cached is None or time.monotonic() - cached[3] >= 1:
+            thread = self.scanning.get(d)
+            if thread is None:
+                thread = threading.Thread(target=self._list, args=(d, cached), daemon=True)
+                self.scanning[d] = thread
+                thread.start()
+            thread.join(self.LISTING_WAIT)
+            with self.lock:
+                cached = self.listings.get(d)
+        if cached is None:
+            return [], set()
+        return cached[1], cached[2]
+
+    def _list(self, d, old):
+        try:
+            try:
+                mtime = os.stat(d).st_mtime_ns
+            except OSError:
+                with self.lock:
+                    self.listings.pop(d, None)
+                return
+            if old and old[0] == mtime:
+                self._store(d, (mtime, old[1], old[2], time.monotonic()))
+                return
+            names, subdirs = [], set()
+            partial_at = time.monotonic() + self.PARTIAL_EVERY
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        names.append(entry.name)
+                        try:
+                            if entry.is_dir():
+                                subdirs.add(entry.name)
+                        except OSError:
+                            pass
+                        if time.monotonic() >= partial_at:
+                            partial = (None, sorted(names), set(subdirs), time.monotonic())
+                            self._store(d, partial)
+                            partial_at = time.monotonic() + self.PARTIAL_EVERY
+            except OSError:
+                pass
+            self._store(d, (mtime, sorted(names), subdirs, time.monotonic()))
+        finally:
+            self.scanning.pop(d, None)
+
+    def _store(self, d, listing):
+        with self.lock:
+            self.listings[d] = listing
+            self.listings.move_to_end(d)
+            if len(self.listings) > 8:
+                self.listings.popitem(last=False)
+
+    def paths(self, word, cwd, dirs_only=False):
+        head, tail = os.path.split(word)
+        d = os.path.join(cwd, os.path.expanduser(head)) if head else cwd
+        names, subdirs = self.listing(d)
+        out = []
+        for name in self._prefixed(names, tail):
+            if name.startswith(".") and not tail.startswith("."):
+                continue
+            if name in subdirs:
+                out.append(os.path.join(head, name) + "/")
+            elif not dirs_only:
+                out.append(os.path.join(head, name))
+        return out
+
+    def complete(self, line, cursor, cwd):
+        """Returns (start of the word being completed, the word, candidates)."""
+        self.refresh()
+        start = line.rfind(" ", 0, cursor) + 1
+        word = line[start:cursor]
+        before = line[:start].split()
+        if not before and word.startswith("!"):
+            start, word = start + 1, word[1:]
+        dirs_only = bool(before) and before[0] == "cd"
+        if "/" in word or word.startswith("~"):
+            return start, word, self.paths(word, cwd, dirs_only)
+        if not before or before[-1] in COMMAND_POSITION:
+            return start, word, self._prefixed(self.commands, word)
+        if dirs_only:
+            return start, word, self.paths(word, cwd, dirs_only=True)
+        if before[0] == "proc" and len(before) == 1:
+            return start, word, [k for k in ProcTable.SORT_KEYS if k.startswith(word)]
+        return start, word, self.paths(word, cwd)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TERMINAL WITH PROC COMMAND
+# ═══════════════════════════════════════════════════════════════════════════════
+class Terminal:
+    def __init__(self, scrollback=100000, spill=False, history=100000):
+        self.output = Scrollback(scrollback, spill=spill)
+        self.output.extend(
+            [
+                "╔═══════════════════════════════════════════════════╗",
+                f"║  SPECTRAL Terminal | {USER}@{HOST}                ║",
+                "║  Commands: help, proc, scan, kill <pid>, clear    ║",
+                "╚═══════════════════════════════════════════════════╝",
+                "",
+            ]
+        )
+        self.cwd = os.getcwd()
+        self.history = History(HISTORY_FILE, history)
+        self.history.preload()
+        self.hist_pos = None
+        self.rsearch = None  # Ctrl+R state: {"query", "match", "saved"}
+        self.completer = Completer()
+        self.completer.refresh(force=True)
+        self.tabbed = False  # Last key was a Tab that completed nothing
+        self.input = ""
+        self.cursor = 0
+        self.scroll = 0
+        self.should_exit = False
+        self.jobs = {}
+        self.fg = None
+        self.job_output = queue.Queue(maxsize=10000)
+        self.session = None
+        self.size = (24, 80)  # PTY rows/cols, kept in sync with the pane
+        self.search = ScrollbackSearch(self.output)
+
+    def prompt(self):
+        if self.fg is not None:
+            return f"[{self.fg.id}] {self.fg.cmd[:20]} ▸ "
+        return f"{USER}@{HOST}:{self.cwd.replace(HOME, '~')}$ "
+
+    # ── jobs ──────────────────────────────────────────────────────────────
+    def start_job(self, cmd, background=False, func=None):
+        jid = max(self.jobs, default=0) + 1
+        try:
+            job = Job(jid, cmd, self.cwd, self.job_output, func)
+        except Exception as e:
+            self.output.append(f"[Error: {e}]")
+            return None
+        self.jobs[jid] = job
+        if background:
+            pid = f" {job.proc.pid}" if job.proc else ""
+            self.output.append(f"[{jid}]{pid}")
+        else:
+            self.fg = job
+        return job
+
+    def pump(self, limit=2000):
+        """Move streamed job output into the scrollback; call once per frame."""
+        moved = 0
+        while moved < limit:
+            try:
+                job, line, extra = self.job_output.get_nowait()
+            except queue.Empty:
+                break
+            moved += 1
+            if line is None:
+                if self.fg is job:
+                    self.fg = None
+                    if job.returncode:
+                        self.output.append(f"[{job.status()}]")
+                else:
+                    self.output.append(f"[{job.id}]+ {job.status():<12} {job.cmd}")
+                self.jobs.pop(job.id, None)
+                continue
+            prefix = "" if self.fg is job else f"[{job.id}] "
+            self.output.append(f"{prefix}[err] {line}" if extra else f"{prefix}{line}")
+        if self.session is not None:
+            moved += self.pump_session()
+        if moved:
+            self.search.poke()
+        return moved
+
+    # ── embedded pty ──────────────────────────────────────────────────────
+    def open_session(self, cmd):
+        if self.session is not None:
+            self.output.append(f"[Busy: {self.session.cmd} is still running]")
+            return
+        try:
+            self.session = PtySession(cmd, self.cwd, *self.size)
+        except Exception as e:
+            self.output.append(f"[Error: {e}]")
+
+    def pump_session(self):
+        session = self.session
+        changed = session.pump()
+        screen = session.screen
+        if screen.scrolled:
+            self.output.extend(screen.scrolled)
+            screen.scrolled.clear()
+        if session.alive:
+            return changed
+        # Keep the final screen of line-oriented tools (python, ssh...)
+        self.output.extend(screen.text_lines())
+        code = session.returncode
+        name = (session.cmd.split() or ["sh"])[0]
+        self.output.append(f"[Exited {name}" + (f": {code}]" if code else "]"))
+        self.session = None
+        return True
+
+    def interrupt(self):
+        """Ctrl+C: signal the foreground job. Returns False if there is none."""
+        if self.fg is None:
+            return False
+        if not self.fg.signal(signal.SIGINT):
+            self.output.append("^C")
+        return True
+
+    def suspend(self):
+        """Ctrl+Z: stop the foreground job and return to the prompt."""
+        job = self.fg
+        if job is None or IS_WINDOWS:
+            return
+        if job.signal(signal.SIGTSTP):
+            job.state = "Stopped"
+        self.fg = None
+        self.output.append(f"[{job.id}]+ {job.state:<12} {job.cmd}")
+
+    def resolve_job(self, arg):
+        arg = arg.strip().lstrip("%")
+        if not arg:
+            return max(self.jobs.values(), key=lambda j: j.id, default=None)
+        try:
+            return self.jobs.get(int(arg))
+        except ValueError:
+            return None
+
+    def job_control(self, name, arg):
+        job = self.resolve_job(arg)
+        if job is None:
+            self.output.append(f"{name}: no such job")
+            return
+        if job.state == "Stopped" and not IS_WINDOWS:
+            job.signal(signal.SIGCONT)
+        job.state = "Running"
+        if name == "fg":
+            self.fg = job
+            self.output.append(job.cmd)
+        else:
+            self.output.append(f"[{job.id}]+ {job.cmd} &")
+
+    def execute(self, cmd):
+        if self.fg is not None:
+            # A foreground job owns the input line: feed its stdin
+            self.output.append(f"{self.prompt()}{cmd}")
+            self.fg.send_input(cmd)
+            self.input = ""
+            self.cursor = 0
+            return
+
+        if not cmd.strip():
+            return
+
+        self.scroll = 0
+
+        self.history.add(cmd)
+        self.hist_pos = None
         self.output.append(f"{self.prompt()}{cmd}")
 
         cmd_lower = cmd.strip().lower()
@@ -747,9 +3919,12 @@ class Terminal:
         # Built-in: help
         if cmd_lower == "help":
             self.output.append("╔═════════ TERMINAL COMMANDS ═════════╗")
-            self.output.append("║ proc       - List active processes  ║")
+            self.output.append("║ proc [cpu|mem|io] [filter] - Procs  ║")
             self.output.append("║ scan       - Network device scan    ║")
             self.output.append("║ kill <pid> - Terminate a process    ║")
+            self.output.append("║ cmd &      - Run command as a job   ║")
+            self.output.append("║ !cmd       - Run in embedded PTY    ║")
+            self.output.append("║ jobs/fg/bg - Job control (^C, ^Z)   ║")
             self.output.append("║ clear      - Clear terminal output  ║")
             self.output.append("║ cd <dir>   - Change directory       ║")
             self.output.append("║ ls, pwd    - Standard shell cmds    ║")
@@ -760,6 +3935,20 @@ class Terminal:
         elif cmd_lower == "about":
             self.output.append(f"SPECTRAL System Interface v1.0.2")
             self.output.append(f"Operator: {USER} // Protocol: SPECTRAL")
+            pc = PREVIEW_CACHE.stats()
+            self.output.append(
+                f"Preview cache: {pc['entries']} files, {pc['hit_rate']:.1f}% hits "
+                f"({pc['hits']}/{pc['hits'] + pc['misses']}), {pc['evictions']} evicted"
+            )
+            sb = self.output.stats()
+            spill = ""
+            if sb["spilled"]:
+                live, total = format_size(sb["spilled_live"]), format_size(sb["spilled"])
+                spill = f", spill file {total} ({live} live)"
+            self.output.append(
+                f"Scrollback: {sb['lines']} lines, {sb['packed']}/{sb['chunks']} chunks "
+                f"compressed{spill}"
+            )
             self.output.append(
                 f"Last system breach: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
             )
@@ -770,34 +3959,41 @@ class Terminal:
             # Since Terminal is a component, we can use a flag.
             self.should_exit = True
 
-        # Built-in: proc - list processes
-        if cmd_lower == "proc":
-            procs = get_processes()
-            self.output.append(f"{'PID':<8} {'NAME':<16} {'CPU%':<8} {'TIME'}")
-            self.output.append("-" * 45)
-            for p in procs[:30]:
-                self.output.append(
-                    f"{p['pid']:<8} {p['name']:<16} {p['cpu']:<8} {p['time']}"
-                )
+        # Built-in: proc [sort] [filter] - list processes
+        elif cmd_lower == "proc" or cmd_lower.startswith("proc "):
+            args = cmd.split()[1:]
+            sort = "cpu"
+            if args and args[0].lower() in ProcTable.SORT_KEYS:
+                sort = args.pop(0).lower()
+            # A cold table takes two /proc walks 0.25s apart: run as a job
+            self.start_job(cmd, func=lambda: self.proc_lines(sort, " ".join(args)))
 
-        # Built-in: scan - network scan
+        # Built-in: scan - network scan (slow, so it runs as a job)
         elif cmd_lower == "scan":
             self.output.append("Scanning network...")
-            devices = scan_network()
-            if devices:
-                self.output.append(f"{'IP':<16} {'MAC':<18} {'VENDOR'}")
-                self.output.append("-" * 55)
-                for d in devices:
-                    self.output.append(f"{d['ip']:<16} {d['mac']:<18} {d['vendor']}")
-            else:
-                self.output.append("No devices found (try: sudo arp-scan -l)")
+            self.start_job("scan", func=self.scan_lines)
+
+        # Built-in: jobs / fg / bg
+        elif cmd_lower == "jobs":
+            for job in sorted(self.jobs.values(), key=lambda j: j.id):
+                self.output.append(f"[{job.id}]  {job.status():<12} {job.cmd}")
 
-        # Built-in: kill <pid>
+        elif cmd_lower.split()[0] in ("fg", "bg"):
+            parts = cmd.split(None, 1)
+            self.job_control(parts[0].lower(), parts[1] if len(parts) > 1 else "")
+
+        # Built-in: kill <pid> | kill %<job>
         elif cmd_lower.startswith("kill "):
             pid = cmd.strip()[5:].strip()
             try:
-                os.kill(int(pid), 9)
-                self.output.append(f"Killed process {pid}")
+                if pid.startswith("%"):
+                    job = self.resolve_job(pid)
+                    if job is None or not job.signal(signal.SIGKILL):
+                        raise ValueError(f"no such job {pid}")
+                    self.output.append(f"Killed job {pid}")
+                else:
+                    os.kill(int(pid), 9)
+                    self.output.append(f"Killed process {pid}")
             except Exception as e:
                 self.output.append(f"Error: {e}")
 
@@ -819,7 +4015,7 @@ class Terminal:
             self.cwd = HOME
 
         elif cmd_lower == "clear":
-            self.output = []
+            self.output.clear()
 
         else:
             # Check for interactive commands
@@ -899,7 +4095,11 @@ class Terminal:
                 cmd = cmd[1:].strip()
                 force_interactive = True
 
-            if force_interactive or base_cmd in interactive_tools:
+            if force_interactive and not cmd:
+                self.output.append("[Usage: !<command> runs it in the embedded terminal]")
+            elif (force_interactive or base_cmd in interactive_tools) and not IS_WINDOWS:
+                self.open_session(cmd)
+            elif force_interactive or base_cmd in interactive_tools:
                 try:
                     # Suspend curses
                     curses.endwin()
@@ -918,35 +4118,104 @@ class Terminal:
                 except Exception as e:
                     self.output.append(f"[Error: {e}]")
             else:
-                try:
-                    result = subprocess.run(
-                        cmd,
-                        shell=True,
-                        capture_output=True,
-                        text=True,
-                        timeout=10,
-                        cwd=self.cwd,
-                        env={**os.environ, "TERM": "xterm"},
-                    )
-                    if result.stdout:
-                        for line in result.stdout.rstrip().split("\n"):
-                            self.output.append(line)
-                    if result.stderr:
-                        for line in result.stderr.rstrip().split("\n"):
-                            self.output.append(f"[err] {line}")
-                except subprocess.TimeoutExpired:
-                    self.output.append("[Timeout after 10s]")
-                except Exception as e:
-                    self.output.append(f"[Error: {e}]")
+                background = cmd.rstrip().endswith("&") and not cmd.rstrip().endswith("&&")
+                if background:
+                    cmd = cmd.rstrip()[:-1].rstrip()
+                self.start_job(cmd, background=background)
 
-        if len(self.output) > 500:
-            self.output = self.output[-500:]
+        self.search.poke()
         self.input = ""
         self.cursor = 0
-        self.should_exit = False
+
+    def proc_lines(self, sort, filt):
+        procs = get_processes(sort, filt, 30)
+        yield f"{'PID':<8} {'USER':<10} {'NAME':<16} {'CPU%':>6} {'MEM':>7} {'THR':>4}  {'TIME'}"
+        yield "-" * 64
+        for p in procs:
+            mem = format_size(p["rss"]) if "rss" in p else "-"
+            yield (
+                f"{p['pid']:<8} {p.get('user', '-')[:10]:<10} {p['name']:<16} "
+                f"{p['cpu']:>6} {mem:>7} {p.get('threads', '-'):>4}  {p['time']}"
+            )
+
+    def scan_lines(self):
+        devices = scan_network()
+        if not devices:
+            yield "No devices found (try: sudo arp-scan -l)"
+            return
+        yield f"{'IP':<16} {'MAC':<18} {'VENDOR'}"
+        yield "-" * 55
+        for d in devices:
+            yield f"{d['ip']:<16} {d['mac']:<18} {d['vendor']}"
+
+    def rsearch_key(self, ch):
+        """Keys while in Ctrl+R search; returns False to accept the match and
+        let the key act on the input line as usual."""
+        rs = self.rsearch
+        if ch == 18:  # Ctrl+R again: next older match
+            if rs["match"]:
+                older = self.history.search(rs["query"], rs["match"][0])
+                rs["match"] = older or rs["match"]
+        elif ch in (7, 27):  # Ctrl+G / Esc: give up and restore the line
+            self.input = rs["saved"]
+            self.cursor = len(self.input)
+            self.rsearch = None
+        elif ch in (127, 8, curses.KEY_BACKSPACE):
+            rs["query"] = rs["query"][:-1]
+            rs["match"] = self.history.search(rs["query"])
+        elif 32 <= ch <= 126:
+            # A longer query can only match at or before the current match
+            rs["query"] += chr(ch)
+            before = rs["match"][0] + 1 if rs["match"] else None
+            rs["match"] = self.history.search(rs["query"], before)
+        else:
+            if rs["match"]:
+                self.input = rs["match"][1]
+                self.cursor = len(self.input)
+                self.hist_pos = rs["match"][0]
+            self.rsearch = None
+            return False
+        return True
+
+    def complete(self):
+        """Tab: complete the word at the cursor; a second Tab lists choices."""
+        start, word, cands = self.completer.complete(self.input, self.cursor, self.cwd)
+        common = os.path.commonprefix(cands) if cands else word
+        if len(cands) == 1 and not common.endswith("/"):
+            common += " "
+        if len(common) > len(word):
+            self.input = self.input[:start] + common + self.input[self.cursor :]
+            self.cursor = start + len(common)
+        elif self.tabbed and len(cands) > 1:
+            self.output.append(f"{self.prompt()}{self.input}")
+            # Like bash: paths are listed by their last component
+            shown = []
+            for c in cands[:200]:
+                name = os.path.basename(c.rstrip("/"))
+                shown.append(name + "/" if c.endswith("/") else name)
+            colw = max(len(c) for c in shown) + 2
+            ncols = max(1, (self.size[1] - 2) // colw)
+            for i in range(0, len(shown), ncols):
+                row = "".join(c.ljust(colw) for c in shown[i : i + ncols])
+                self.output.append(row.rstrip())
+            if len(cands) > len(shown):
+                self.output.append(f"... {len(cands) - len(shown)} more")
+            self.scroll = 0
+        else:
+            self.tabbed = True
+            return
+        self.tabbed = False
 
     def type_key(self, ch):
-        if ch == 10 or ch == 13:
+        if self.rsearch is not None and self.rsearch_key(ch):
+            return
+        if ch != 9:
+            self.tabbed = False
+        if ch == 9:
+            self.complete()
+        elif ch == 18:  # Ctrl+R
+            self.rsearch = {"query": "", "match": None, "saved": self.input}
+        elif ch == 10 or ch == 13:
             self.execute(self.input)
         elif ch == 127 or ch == curses.KEY_BACKSPACE or ch == 8:
             if self.cursor > 0:
@@ -959,19 +4228,15 @@ class Terminal:
             if self.cursor < len(self.input):
                 self.cursor += 1
         elif ch == curses.KEY_UP:
-            if self.history and self.hist_idx < len(self.history) - 1:
-                self.hist_idx += 1
-                self.input = self.history[-(self.hist_idx + 1)]
+            entry = self.history.older(self.hist_pos)
+            if entry:
+                self.hist_pos, self.input = entry
                 self.cursor = len(self.input)
         elif ch == curses.KEY_DOWN:
-            if self.hist_idx > 0:
-                self.hist_idx -= 1
-                self.input = self.history[-(self.hist_idx + 1)]
+            if self.hist_pos is not None:
+                entry = self.history.newer(self.hist_pos)
+                self.hist_pos, self.input = entry or (None, "")
                 self.cursor = len(self.input)
-            elif self.hist_idx == 0:
-                self.hist_idx = -1
-                self.input = ""
-                self.cursor = 0
         elif 32 <= ch <= 126:
             self.input = self.input[: self.cursor] + chr(ch) + self.input[self.cursor :]
             self.cursor += 1
@@ -980,23 +4245,113 @@ class Terminal:
 # ═══════════════════════════════════════════════════════════════════════════════
 # TUI ENGINE
 # ═══════════════════════════════════════════════════════════════════════════════
+# Pacing per power profile. "frame" is the minimum time between redraws and
+# "clock" the TIME panel's resolution, in seconds; "active", "idle" and
+# "unfocused" multiply every collector interval in those states, and the UI
+# counts as idle after "idle_after" seconds without a key press.
+POWER_PROFILES = {
+    "normal": {
+        "frame": 1 / 60,
+        "clock": 1,
+        "idle_after": 60,
+        "active": 1,
+        "idle": 2,
+        "unfocused": 4,
+    },
+    "low-power": {
+        "frame": 0.1,
+        "clock": 60,
+        "idle_after": 15,
+        "active": 2,
+        "idle": 5,
+        "unfocused": 10,
+    },
+}
+
+
 class SpectreTUI:
-    def __init__(self, stdscr):
+    PANES = {
+        "draw_filesystem": 0,
+        "draw_terminal": 1,
+        "draw_preview": 2,
+        "draw_procs": 3,
+    }
+    DOUBLE_CLICK = 0.4
+
+    def __init__(self, stdscr, low_power=False):
+        WAKER.open()
+        EVENTS.start()
         self.stdscr = stdscr
         self.running = True
-        self.active_pane = 1  # 0=fs, 1=terminal
-        self.file_browser = FileBrowser()
-        self.terminal = Terminal()
+        self.active_pane = 1  # 0=fs, 1=terminal, 2=preview, 3=processes
+        self.show_procs = False
+        self.proc_sel = 0
+        self.proc_scroll = 0
+        self.proc_filter_input = None
+        self.pager = None
+        self.pager_input = ""
+        self.preview_rows = 1
+        self.fs_search = None
+        self.term_find = None
+        self.term_rows = 1
+        self.fs_rows = 1
+        self.raw_keys = False
+        self.panels = {}  # draw method name -> [window, geometry, content key]
+        # (pressed, released, clicked, double-clicked) masks per forwarded button
+        self.buttons = (
+            (
+                curses.BUTTON1_PRESSED,
+                curses.BUTTON1_RELEASED,
+                curses.BUTTON1_CLICKED,
+                curses.BUTTON1_DOUBLE_CLICKED,
+            ),
+            (
+                curses.BUTTON2_PRESSED,
+                curses.BUTTON2_RELEASED,
+                curses.BUTTON2_CLICKED,
+                curses.BUTTON2_DOUBLE_CLICKED,
+            ),
+            (
+                curses.BUTTON3_PRESSED,
+                curses.BUTTON3_RELEASED,
+                curses.BUTTON3_CLICKED,
+                curses.BUTTON3_DOUBLE_CLICKED,
+            ),
+        )
+        self.wheel_down = getattr(curses, "BUTTON5_PRESSED", 0)  # Not in old ABIs
+        self.layout = None
+        self.generation = 0
+        self.repaints = 0
+        self.resized = False
+        self.canvas = None
+        self.vt_attrs = {}
+        self.vt_pairs = {}
 
         # Load Persistence
         config = load_config()
+        self.terminal = Terminal(
+            config.get("scrollback", 100000),
+            config.get("scrollback_spill", False),
+            config.get("history_size", 100000),
+        )
         self.theme_idx = config.get("theme", 0)
+        profile = "low-power" if low_power else config.get("profile", "normal")
+        self.profile = POWER_PROFILES.get(profile, POWER_PROFILES["normal"])
+        for name, interval in config.get("intervals", {}).items():
+            try:
+                COLLECTOR.set_interval(name, interval)
+            except (TypeError, ValueError):
+                pass
+        self.focused = True
+        self.last_input = time.monotonic()
+        self.spark_coarse = False  # F2: sparkline cells are minutes, not seconds
+        self.show_profile = False  # F12: cost overlay
+        self.input_at = None  # When the first input not yet on screen arrived
         saved_path = config.get("path", HOME)
-        if os.path.isdir(saved_path):
-            self.file_browser.path = saved_path
-            self.terminal.cwd = saved_path
-
-        self.last_stats = 0
+        if not os.path.isdir(saved_path):
+            saved_path = HOME
+        self.file_browser = FileBrowser(saved_path)
+        self.terminal.cwd = saved_path
 
         curses.start_color()
         curses.use_default_colors()
@@ -1005,19 +4360,32 @@ class SpectreTUI:
         curses.cbreak()
         self.stdscr.nodelay(True)
         self.stdscr.keypad(True)
-        curses.mousemask(curses.ALL_MOUSE_EVENTS | curses.REPORT_MOUSE_POSITION)
-        print("\033[?1003h")  # Enable mouse tracking
+        if hasattr(curses, "set_escdelay"):
+            curses.set_escdelay(25)  # A lone ESC must reach vi promptly
+        # Clicks and the wheel only; motion tracking is switched on by
+        # track_motion() while a focused pty app asks for it. Interval 0 gets
+        # raw press/release events instead of delayed synthesized clicks.
+        curses.mousemask(curses.ALL_MOUSE_EVENTS)
+        curses.mouseinterval(0)
+        self.motion = 0
+        self.mouse_held = 3
+        self.last_click = (0, None)
+        print("\033[?1004h", end="", flush=True)  # Report focus in/out as ESC [ I/O
 
         self.apply_theme()
         self.stdscr.bkgd(" ", curses.color_pair(1))
         self.height, self.width = stdscr.getmaxyx()
+        self.canvas = (self.stdscr, 0, 0, self.height, self.width)
 
-        self.net_info = get_network_info()
-        self.ping = ping_host()
-        self.down_speed, self.up_speed = NET_SPEED.update()
+        track_history()
+        COLLECTOR.start()
+        STARTUP.mark("init")
 
     def apply_theme(self):
-        theme = THEMES[THEME_NAMES[self.theme_idx]]
+        theme = {
+            role: getattr(curses, f"COLOR_{name.upper()}")
+            for role, name in THEMES[THEME_NAMES[self.theme_idx]].items()
+        }
         curses.init_pair(1, theme["primary"], curses.COLOR_BLACK)
         curses.init_pair(2, theme["secondary"], curses.COLOR_BLACK)
         curses.init_pair(3, curses.COLOR_RED, curses.COLOR_BLACK)
@@ -1038,20 +4406,26 @@ class SpectreTUI:
     def cycle_theme(self):
         self.theme_idx = (self.theme_idx + 1) % len(THEME_NAMES)
         self.apply_theme()
+        self.layout = None  # Colour pairs changed under every cell: repaint all
         EVENTS.add(f"Theme changed to {THEME_NAMES[self.theme_idx].upper()}")
 
     def safe_addstr(self, y, x, text, attr=0):
-        if 0 <= y < self.height and 0 <= x < self.width:
+        # Screen coordinates, clipped to the panel window being rendered
+        win, oy, ox, wh, ww = self.canvas
+        y, x = y - oy, x - ox
+        if 0 <= y < wh and 0 <= x < ww:
             try:
-                self.stdscr.addstr(y, x, text[: self.width - x - 1], attr)
+                win.addstr(y, x, text[: ww - x], attr)
             except:
                 pass
 
     def draw_box(self, y, x, h, w, title="", active=False):
+        # Panel windows start blank, so only the frame itself is written
         color = self.WHITE if active else self.GREEN
         self.safe_addstr(y, x, "╔" + "═" * (w - 2) + "╗", color)
         for i in range(1, h - 1):
-            self.safe_addstr(y + i, x, "║" + " " * (w - 2) + "║", color)
+            self.safe_addstr(y + i, x, "║", color)
+            self.safe_addstr(y + i, x + w - 1, "║", color)
         self.safe_addstr(y + h - 1, x, "╚" + "═" * (w - 2) + "╝", color)
         if title:
             self.safe_addstr(y, x + 2, f"╣ {title} ╠", color)
@@ -1074,17 +4448,20 @@ class SpectreTUI:
     def draw_stats(self, y, x, h, w):
         self.draw_box(y, x, h, w, "SYSTEM")
 
-        now = time.time()
-        if now - self.last_stats > 5:
-            self.last_stats = now
-            self.net_info = get_network_info()
-            self.ping = ping_host()
-            self.down_speed, self.up_speed = NET_SPEED.update()
-
-        cpu = get_cpu_usage()
-        mem_str, mem_pct = get_memory_usage()
-        disk_str, disk_pct = get_disk_usage()
-        load = get_load_avg()
+        snap = COLLECTOR.get()
+        cpu = snap["cpu"]["total"]
+        mem_str, mem_pct = snap["mem"]
+        disk_str, disk_pct = snap["disk"]
+        load = snap["load"]
+        net_info = snap["net_info"]
+        ping = snap["ping"]
+        down_speed, up_speed = snap["net_speed"]
+        ping_color = self.GREEN if "ms" in str(ping) else self.RED
+        # Slow probes show a placeholder until their first result lands
+        if "net_info" not in COLLECTOR.ready:
+            net_info = {"ssid": "…", "ip": "…"}
+        if "ping" not in COLLECTOR.ready:
+            ping, ping_color = "…", self.DIM
 
         stats = [
             ("USER", USER, self.CYAN),
@@ -1101,11 +4478,11 @@ class SpectreTUI:
                 self.GREEN if disk_pct < 90 else self.RED,
             ),
             ("LOAD", load, self.YELLOW),
-            ("SSID", self.net_info.get("ssid", "N/A"), self.WHITE),
-            ("IP", self.net_info.get("ip", "N/A"), self.WHITE),
-            ("DOWN", self.down_speed, self.CYAN),
-            ("UP", self.up_speed, self.CYAN),
-            ("PING", self.ping, self.GREEN if "ms" in str(self.ping) else self.RED),
+            ("SSID", net_info.get("ssid", "N/A"), self.WHITE),
+            ("IP", net_info.get("ip", "N/A"), self.WHITE),
+            ("DOWN", down_speed, self.CYAN),
+            ("UP", up_speed, self.CYAN),
+            ("PING", ping, ping_color),
         ]
 
         # Check for system events
@@ -1116,123 +4493,247 @@ class SpectreTUI:
 
         for i, (k, v, color) in enumerate(stats):
             if y + 1 + i < y + h - 1:
-                self.safe_addstr(y + 1 + i, x + 2, f"{k}:", self.DIM)
-                self.safe_addstr(y + 1 + i, x + 7, str(v)[: w - 9], color)
+                self.draw_metric(y + 1 + i, x, w, k, v, color)
+
+    # Rows that get a sparkline, by label -> HISTORY series
+    SPARK_ROWS = {
+        "CPU": "cpu",
+        "MEM": "mem",
+        "DISK": "disk",
+        "LOAD": "load",
+        "DOWN": "down",
+        "UP": "up",
+        "PING": "ping",
+        "TEMP": "temp",
+        "CONN": "conn",
+    }
+
+    def draw_metric(self, row, x, w, label, value, color):
+        """A "LABEL: value" row, with the metric's recent trend on the right."""
+        self.safe_addstr(row, x + 2, f"{label}:", self.DIM)
+        series = self.SPARK_ROWS.get(label)
+        spark_w = w - 24
+        if series is None or spark_w < 8:
+            self.safe_addstr(row, x + 7, str(value)[: w - 9], color)
+            return
+        self.safe_addstr(row, x + 7, str(value)[:14], color)
+        spark = HISTORY.sparkline(series, spark_w, self.spark_coarse)
+        self.safe_addstr(row, x + 22, spark, color)
 
     def draw_monitor(self, y, x, h, w):
         self.draw_box(y, x, h, w, "MONITOR")
         row = 1
 
-        now = time.time()
-        # Cache monitor stats to avoid UI lag
-        if not hasattr(self, "mon_cache"):
-            self.mon_cache = {
-                "temp": "N/A",
-                "gpu": "N/A",
-                "bat": "N/A",
-                "conns": "0",
-                "ports": [],
-                "dio": "N/A",
-                "cores": [],
-                "last_upd": 0,
-            }
-
-        if now - self.mon_cache["last_upd"] > 2:
-            self.mon_cache["temp"] = get_cpu_temp()
-            self.mon_cache["gpu"] = get_gpu_usage()
-            self.mon_cache["bat"] = get_battery()
-            self.mon_cache["conns"] = get_connections()
-            self.mon_cache["ports"] = get_open_ports()
-            self.mon_cache["dio"] = get_disk_io()
-            self.mon_cache["cores"] = get_per_core_cpu()
-            self.mon_cache["last_upd"] = now
-
-        c = self.mon_cache
+        # Values come from the collector snapshot; never block the frame on I/O
+        c = COLLECTOR.get()
+        socks = c["sockets"]
+        conn = str(socks["established"])
+        tw = socks["states"].get("TIME_WAIT", 0)
+        if tw:
+            conn += f" (tw {tw})"
+        peer = "-"
+        if socks["remotes"]:
+            host, count = socks["remotes"][0]
+            peer = f"{host} x{count}"
         items = [
             ("TEMP", c["temp"]),
             ("GPU", c["gpu"]),
             ("BAT", c["bat"]),
-            ("CONN", c["conns"]),
-            ("PORT", ",".join(c["ports"][:3])),
+            ("CONN", conn),
+            ("PEER", peer),
+            ("PORT", ",".join(str(p) for p in socks["listen"][:6]) or "None"),
             ("I/O", c["dio"]),
         ]
 
         for k, v in items:
             if y + row < y + h - 1:
-                self.safe_addstr(y + row, x + 2, f"{k}:", self.DIM)
-                self.safe_addstr(y + row, x + 7, str(v)[: w - 9], self.CYAN)
+                self.draw_metric(y + row, x, w, k, v, self.CYAN)
                 row += 1
 
-        # Core bars
-        self.safe_addstr(y + row, x + 2, "CORE:", self.DIM)
+        # Core bars, stacked by state and packed into columns when needed
+        cpu = c["cpu"]
+        states = cpu["states"]
+        head = "CORE:"
+        if states:
+            head += " u{:.0f} s{:.0f} w{:.0f} i{:.0f} st{:.0f}".format(
+                *(states[k] for k in CpuSampler.STATES)
+            )
+        self.safe_addstr(y + row, x + 2, head[: w - 4], self.DIM)
         row += 1
-        bar_w = w - 8
-        for i, usage in enumerate(c["cores"]):
-            if y + row < y + h - 1:
-                filled = int((usage / 100) * bar_w) if bar_w > 0 else 0
-                bar = "█" * filled + "░" * (bar_w - filled)
-                color = (
-                    self.GREEN
-                    if usage < 70
-                    else self.YELLOW
-                    if usage < 90
-                    else self.RED
-                )
-                self.safe_addstr(y + row, x + 3, f"{i}:", self.DIM)
-                self.safe_addstr(y + row, x + 5, bar[:bar_w], color)
-                row += 1
+        cores = cpu["cores"]
+        avail = h - 1 - row
+        if not cores or avail <= 0:
+            return
+        per_row = -(-len(cores) // avail)
+        cell_w = (w - 5) // per_row
+        label_w = len(str(len(cores) - 1)) + 1
+        for i, usage in enumerate(cores):
+            r, col = divmod(i, per_row)
+            cx = x + 3 + col * cell_w
+            bar_w = cell_w - label_w - 1
+            if bar_w <= 0:
+                break
+            self.safe_addstr(y + row + r, cx, f"{i}:", self.DIM)
+            self.draw_cpu_bar(y + row + r, cx + label_w, bar_w, usage, cpu, i)
+
+    def draw_cpu_bar(self, y, x, bar_w, usage, cpu, idx):
+        """Draw one core as user/system/irq+steal segments over a dim track.
+
+        iowait is idle time, as in the usage figure, so it is shaded rather
+        than filled: the solid part of the bar always matches the number.
+        """
+        core_states = cpu["core_states"]
+        if idx < len(core_states):
+            st = core_states[idx]
+            segments = [
+                (st["user"], "█", self.GREEN),
+                (st["system"], "█", self.CYAN),
+                (st["irq"] + st["steal"], "█", self.YELLOW if usage < 90 else self.RED),
+                (st["iowait"], "▒", self.YELLOW),
+            ]
+        else:
+            color = self.GREEN if usage < 70 else self.YELLOW if usage < 90 else self.RED
+            segments = [(usage, "█", color)]
+        pos = 0
+        for pct, glyph, color in segments:
+            n = min(bar_w - pos, int(round(pct / 100 * bar_w)))
+            if n > 0:
+                self.safe_addstr(y, x + pos, glyph * n, color)
+                pos += n
+        if pos < bar_w:
+            self.safe_addstr(y, x + pos, "░" * (bar_w - pos), self.DIM)
 
     def draw_time(self, y, x, h, w):
         self.draw_box(y, x, h, w, "TIME")
         now = datetime.now()
         cy = y + h // 2 - 1
-        self.safe_addstr(cy, x + (w - 8) // 2, now.strftime("%H:%M:%S"), self.GREEN)
+        clock = now.strftime("%H:%M:%S" if self.profile["clock"] < 60 else "%H:%M")
+        self.safe_addstr(cy, x + (w - len(clock)) // 2, clock, self.GREEN)
         self.safe_addstr(cy + 1, x + (w - 10) // 2, now.strftime("%Y-%m-%d"), self.CYAN)
         self.safe_addstr(
             cy + 2, x + (w - len(now.strftime("%A"))) // 2, now.strftime("%A"), self.DIM
         )
 
     def draw_filesystem(self, y, x, h, w):
-        self.draw_box(y, x, h, w, "FILESYSTEM", active=(self.active_pane == 0))
-
-        path = self.file_browser.path
-        if len(path) > w - 6:
-            path = "..." + path[-(w - 9) :]
-        self.safe_addstr(y + 1, x + 2, path, self.CYAN)
+        fb = self.file_browser
+        fb.sync()
+        listing = fb.listing
+        title = "FILESYSTEM"
+        if listing.loading:
+            title += f" ⟳ {listing.scanned:,}"
+        elif len(listing) > 1000:
+            title += f" {len(listing):,}"
+        self.draw_box(y, x, h, w, title, active=(self.active_pane == 0))
+
+        if self.fs_search is not None:
+            self.safe_addstr(y + 1, x + 2, f"/{self.fs_search}█"[: w - 4], self.YELLOW)
+        else:
+            path = fb.path
+            if len(path) > w - 6:
+                path = "..." + path[-(w - 9) :]
+            self.safe_addstr(y + 1, x + 2, path, self.CYAN)
 
         visible = h - 4
-        items = self.file_browser.items
-        sel = self.file_browser.selected
+        self.fs_rows = visible  # PgUp/PgDn step
+        sel = fb.selected
 
-        if sel >= self.file_browser.scroll + visible:
-            self.file_browser.scroll = sel - visible + 1
-        if sel < self.file_browser.scroll:
-            self.file_browser.scroll = sel
+        if sel >= fb.scroll + visible:
+            fb.scroll = sel - visible + 1
+        if sel < fb.scroll:
+            fb.scroll = sel
 
-        start = self.file_browser.scroll
-        for i in range(min(visible, len(items) - start)):
+        start = fb.scroll
+        for i in range(max(0, min(visible, fb.count() - start))):
             idx = start + i
-            if idx < len(items):
-                icon, name, is_dir = items[idx]
-                row = y + 2 + i
-                color = (
-                    self.CYAN
-                    if is_dir
-                    else self.DIM
-                    if name.startswith(".")
-                    else self.WHITE
-                )
-                text = f"  {icon} {name}"[: w - 4]
-                if idx == sel:
-                    self.safe_addstr(row, x + 2, " " * (w - 4), self.INV_WHITE)
-                    self.safe_addstr(row, x + 2, f"▸{text[1:]}", self.INV_WHITE)
-                else:
-                    self.safe_addstr(row, x + 2, text, color)
+            icon, name, kind, li = fb.entry(idx)
+            row = y + 2 + i
+            is_dir = kind in DIR_KINDS
+            color = (
+                self.CYAN
+                if is_dir
+                else self.RED
+                if kind == KIND_BROKEN
+                else self.DIM
+                if name.startswith(".")
+                else self.WHITE
+            )
+            text = f"  {icon} {name}"
+            size = ""
+            if li is not None and not is_dir and kind != KIND_BROKEN and w >= 40:
+                meta = listing.stat(name)
+                size = format_size(meta[0]) if meta else "…"
+                text = text[: w - 6 - len(size)]
+            text = text[: w - 4]
+            if idx == sel:
+                self.safe_addstr(row, x + 2, " " * (w - 4), self.INV_WHITE)
+                self.safe_addstr(row, x + 2, f"▸{text[1:]}", self.INV_WHITE)
+                if size:
+                    self.safe_addstr(row, x + w - 3 - len(size), size, self.INV_WHITE)
+            else:
+                self.safe_addstr(row, x + 2, text, color)
+                if size:
+                    self.safe_addstr(row, x + w - 3 - len(size), size, self.DIM)
+
+    def pty_focused(self):
+        return self.active_pane == 1 and self.terminal.session is not None
+
+    def vt_attr(self, attr):
+        """Map a packed VTScreen attribute to a curses attribute."""
+        a = self.vt_attrs.get(attr)
+        if a is None:
+            fg, bg = attr & 0xF, (attr >> 4) & 0xF
+            key = (7 if fg == 8 else fg, curses.COLOR_BLACK if bg == 8 else bg)
+            pair = self.vt_pairs.get(key)
+            if pair is None:
+                pair = 16 + len(self.vt_pairs)
+                try:
+                    curses.init_pair(pair, *key)
+                except:
+                    pair = 0  # Out of colour pairs
+                self.vt_pairs[key] = pair
+            a = curses.color_pair(pair)
+            if attr & VTScreen.BOLD:
+                a |= curses.A_BOLD
+            if attr & VTScreen.UNDERLINE:
+                a |= curses.A_UNDERLINE
+            if attr & VTScreen.REVERSE:
+                a |= curses.A_REVERSE
+            self.vt_attrs[attr] = a
+        return a
+
+    def draw_session(self, y, x, h, w):
+        session = self.terminal.session
+        focused = self.active_pane == 1
+        hint = "^] release" if focused else "TAB to focus"
+        title = f"TERMINAL ─ {session.cmd[:w // 3]} [{hint}]"
+        self.draw_box(y, x, h, w, title, active=focused)
+        self.terminal.size = (h - 2, w - 2)
+        session.resize(h - 2, w - 2)
+        screen = session.screen
+        for r, row in enumerate(screen.runs()):
+            for col, text, attr in row:
+                self.safe_addstr(y + 1 + r, x + 1 + col, text, self.vt_attr(attr))
+        if focused and screen.cursor_visible:
+            cy, cx = screen.cy, min(screen.cx, screen.cols - 1)
+            attr = self.vt_attr(screen.attrs[cy][cx]) ^ curses.A_REVERSE
+            self.safe_addstr(y + 1 + cy, x + 1 + cx, screen.chars[cy][cx], attr)
 
     def draw_terminal(self, y, x, h, w):
+        if self.terminal.session is not None:
+            return self.draw_session(y, x, h, w)
+        self.terminal.size = (h - 2, w - 2)
         self.draw_box(y, x, h, w, "TERMINAL", active=(self.active_pane == 1))
 
         visible = h - 4
+        self.term_rows = visible
+        find = self.term_find
+        if find is not None:
+            self.update_find()
+            if find["line"] is not None:
+                # Keep the current match centred while output keeps arriving
+                below = self.terminal.output.end - 1 - find["line"]
+                self.terminal.scroll = below - visible // 2
+
         # Clamp scroll
         max_scroll = max(0, len(self.terminal.output) - visible)
         self.terminal.scroll = max(0, min(self.terminal.scroll, max_scroll))
@@ -1248,13 +4749,52 @@ class SpectreTUI:
         else:
             lines = self.terminal.output[-visible:]
 
+        top = self.terminal.output.end - self.terminal.scroll - len(lines)
+        pattern = find["pattern"] if find else None
         for i, line in enumerate(lines):
             if y + 1 + i < y + h - 3:
                 color = self.RED if "[err]" in line or "Error" in line else self.WHITE
-                self.safe_addstr(y + 1 + i, x + 2, line[: w - 4], color)
+                text = line[: w - 4]
+                self.safe_addstr(y + 1 + i, x + 2, text, color)
+                if pattern is None:
+                    continue
+                hit = self.YELLOW | curses.A_REVERSE
+                if top + i == find["line"]:
+                    hit = self.INV
+                for m in pattern.finditer(text):
+                    if m.end() > m.start():
+                        self.safe_addstr(y + 1 + i, x + 2 + m.start(), m.group(), hit)
 
-        prompt = self.terminal.prompt()
         input_y = y + h - 2
+        if find is not None:
+            rank, count, done = self.terminal.search.progress(find["line"])
+            if find["error"]:
+                status = find["error"]
+            else:
+                status = f"{rank}/{count}" if find["line"] is not None else f"{count} hits"
+                status += "" if done else "…"
+            label = f"{'regex' if find['regex'] else 'find'}: {find['text']}"
+            if find["editing"]:
+                label, hint = label + "█", "Tab:regex ⏎:go Esc:close"
+            else:
+                hint = "n/N:older/newer ^F:edit Esc:close"
+            line = f"{label}  [{status}]  {hint}"
+            self.safe_addstr(input_y, x + 2, line[: w - 4], self.YELLOW)
+            return
+
+        rs = self.terminal.rsearch
+        if rs is not None:
+            label = "reverse-i-search"
+            if rs["query"] and not rs["match"]:
+                label = "failing " + label
+            prompt = f"({label})`{rs['query']}': "
+            match = rs["match"][1] if rs["match"] else ""
+            self.safe_addstr(input_y, x + 2, prompt[: w - 4], self.YELLOW)
+            if len(prompt) < w - 4:
+                self.safe_addstr(input_y, x + 2 + len(prompt), match[: w - 4 - len(prompt)], self.GREEN)
+            return
+
+        prompt = self.terminal.prompt()
         self.safe_addstr(
             input_y, x + 2, f"{prompt}{self.terminal.input}"[: w - 4], self.GREEN
         )
@@ -1264,26 +4804,267 @@ class SpectreTUI:
             if cursor_x < x + w - 2:
                 self.safe_addstr(input_y, cursor_x, "█", self.WHITE)
 
+    def open_find(self):
+        self.term_find = {
+            "text": "",
+            "regex": False,
+            "editing": True,
+            "line": None,
+            "pattern": None,
+            "error": "",
+        }
+
+    def set_find_text(self, text):
+        find = self.term_find
+        find.update(text=text, line=None, pattern=None, error="")
+        if not text:
+            self.terminal.search.stop()
+            return
+        try:
+            find["pattern"] = self.terminal.search.search(text, find["regex"])["pattern"]
+        except re.error as e:
+            find["error"] = str(e)
+
+    def update_find(self):
+        """While typing a pattern, track the newest hit as the scan finds them."""
+        find = self.term_find
+        if find["editing"] and find["pattern"] is not None:
+            find["line"] = self.terminal.search.neighbor(self.terminal.output.end, -1)
+
+    def handle_find_key(self, key):
+        """Keys for the scrollback search prompt; returns False if not consumed."""
+        find = self.term_find
+        if key == 27:  # Esc: close, leaving the view where it is
+            self.terminal.search.stop()
+            self.term_find = None
+        elif find["editing"]:
+            if key in (10, 13):
+                find["editing"] = False
+            elif key == 9:  # TAB
+                find["regex"] = not find["regex"]
+                self.set_find_text(find["text"])
+            elif key in (127, 8, curses.KEY_BACKSPACE):
+                self.set_find_text(find["text"][:-1])
+            elif 32 <= key <= 126:
+                self.set_find_text(find["text"] + chr(key))
+        elif key in (ord("n"), ord("N")):
+            line = self.terminal.output.end if find["line"] is None else find["line"]
+            hit = self.terminal.search.neighbor(line, -1 if key == ord("n") else 1)
+            if hit is not None:
+                find["line"] = hit
+        elif key == 6:  # Ctrl+F
+            find["editing"] = True
+        else:
+            self.terminal.search.stop()
+            self.term_find = None
+            return False
+        return True
+
     def draw_preview(self, y, x, h, w):
         """Draw file preview panel."""
-        self.draw_box(y, x, h, w, "PREVIEW")
+        self.draw_box(y, x, h, w, "PREVIEW", active=(self.active_pane == 2))
 
         if self.file_browser.selected_file:
             filepath = self.file_browser.selected_file
+            pager = self.get_pager(filepath)
             fname = os.path.basename(filepath)
+            pos = f":{self.pager_input}" if self.pager_input else pager.position()
             self.safe_addstr(y + 1, x + 2, fname[: w - 4], self.CYAN)
+            if len(fname) + len(pos) + 1 < w - 4:
+                self.safe_addstr(y + 1, x + w - 2 - len(pos), pos, self.DIM)
 
-            lines = read_file_preview(filepath, h - 4)
+            self.preview_rows = h - 3
+            lines = pager.lines(h - 3)
             for i, line in enumerate(lines):
                 if y + 2 + i < y + h - 1:
                     self.safe_addstr(y + 2 + i, x + 2, line[: w - 4], self.WHITE)
         else:
             self.safe_addstr(y + h // 2, x + 2, "Select a file to preview", self.DIM)
 
-    def draw_status(self, y):
+    def get_pager(self, filepath):
+        if self.pager is None or self.pager.path != filepath:
+            if self.pager is not None:
+                self.pager.close()
+            meta = self.file_browser.selected_meta()
+            size = meta[0] if meta else None
+            self.pager = open_pager(filepath, follow=is_log_file(filepath), size=size)
+            self.pager_input = ""
+        return self.pager
+
+    def toggle_follow(self):
+        filepath = self.file_browser.selected_file
+        follow = not isinstance(self.pager, FollowPager)
+        self.pager.close()
+        meta = self.file_browser.selected_meta()
+        self.pager = open_pager(filepath, follow=follow, size=meta[0] if meta else None)
+        follow = isinstance(self.pager, FollowPager)  # Binary files are never tailed
+        EVENTS.add(f"Follow {'on' if follow else 'off'}: {os.path.basename(filepath)}")
+
+    def handle_fs_key(self, key):
+        fb = self.file_browser
+        page = max(1, self.fs_rows)
+        if self.fs_search is not None:
+            if key in (10, 13, 27):
+                self.fs_search = None
+            elif key in (127, 8, curses.KEY_BACKSPACE):
+                self.fs_search = self.fs_search[:-1]
+                if self.fs_search:
+                    fb.jump_prefix(self.fs_search)
+            elif 32 <= key <= 126:
+                self.fs_search += chr(key)
+                fb.jump_prefix(self.fs_search)
+            return
+        if key == curses.KEY_UP:
+            fb.up()
+        elif key == curses.KEY_DOWN:
+            fb.down()
+        elif key == curses.KEY_PPAGE:
+            fb.jump(fb.selected - page)
+        elif key == curses.KEY_NPAGE:
+            fb.jump(fb.selected + page)
+        elif key == curses.KEY_HOME:
+            fb.jump(0)
+        elif key == curses.KEY_END:
+            fb.jump(fb.count() - 1)
+        elif key == ord("/"):
+            self.fs_search = ""
+        elif key == 10:
+            fb.enter()
+
+    def handle_preview_key(self, key):
+        """less-style paging: arrows, PgUp/PgDn, g/G, N<Enter>, N%, f follow."""
+        if not self.file_browser.selected_file:
+            return
+        pager = self.get_pager(self.file_browser.selected_file)
+        page = max(1, self.preview_rows - 1)
+        if ord("0") <= key <= ord("9"):
+            self.pager_input += chr(key)
+        elif key in (10, 13, ord("g")) and self.pager_input:
+            pager.goto_line(int(self.pager_input))
+            self.pager_input = ""
+        elif key == ord("%") and self.pager_input:
+            pager.goto_percent(int(self.pager_input))
+            self.pager_input = ""
+        elif key == 27:
+            self.pager_input = ""
+        elif key == curses.KEY_UP:
+            pager.scroll(-1)
+        elif key == curses.KEY_DOWN:
+            pager.scroll(1)
+        elif key == curses.KEY_PPAGE:
+            pager.scroll(-page)
+        elif key in (curses.KEY_NPAGE, ord(" ")):
+            pager.scroll(page)
+        elif key in (curses.KEY_HOME, ord("g")):
+            pager.home()
+        elif key in (curses.KEY_END, ord("G")):
+            pager.end(page)
+        elif key in (ord("f"), ord("F")):
+            self.toggle_follow()
+
+    def draw_procs(self, y, x, h, w):
+        """Draw the live process pane from the collector snapshot."""
+        title = f"PROCESSES [{PROC_TABLE.sort}]"
+        self.draw_box(y, x, h, w, title, active=(self.active_pane == 3))
+        procs = COLLECTOR.get()["procs"]
+
+        if self.proc_filter_input is not None:
+            self.safe_addstr(y + 1, x + 2, f"/{self.proc_filter_input}█"[: w - 4], self.YELLOW)
+        elif PROC_TABLE.filter:
+            self.safe_addstr(y + 1, x + 2, f"filter: {PROC_TABLE.filter}"[: w - 4], self.YELLOW)
+        else:
+            self.safe_addstr(y + 1, x + 2, f"{len(procs)} shown"[: w - 4], self.DIM)
+
+        wide = w >= 50
+        head = f"{'PID':>7} {'NAME':<15} {'CPU%':>5} {'MEM':>6}"
+        if wide:
+            head += f" {'THR':>4} {'USER':<8}"
+        self.safe_addstr(y + 2, x + 2, head[: w - 4], self.CYAN)
+
+        visible = h - 4
+        self.proc_sel = max(0, min(self.proc_sel, len(procs) - 1))
+        if self.proc_sel >= self.proc_scroll + visible:
+            self.proc_scroll = self.proc_sel - visible + 1
+        if self.proc_sel < self.proc_scroll:
+            self.proc_scroll = self.proc_sel
+
+        for i, p in enumerate(procs[self.proc_scroll : self.proc_scroll + visible]):
+            idx = self.proc_scroll + i
+            line = f"{p['pid']:>7} {p['name']:<15} {p['cpu']:>5} {format_size(p['rss']):>6}"
+            if wide:
+                line += f" {p['threads']:>4} {p['user'][:8]:<8}"
+            line = line[: w - 4]
+            if idx == self.proc_sel and self.active_pane == 3:
+                self.safe_addstr(y + 3 + i, x + 2, line.ljust(w - 4), self.INV_WHITE)
+            else:
+                color = self.RED if p["cpu"] >= 80 else self.WHITE
+                self.safe_addstr(y + 3 + i, x + 2, line, color)
+
+    def toggle_procs(self):
+        self.show_procs = not self.show_procs
+        COLLECTOR.set_enabled("procs", self.show_procs)
+        if not self.show_procs and self.active_pane == 3:
+            self.active_pane = 1
+
+    def handle_procs_key(self, key):
+        if self.proc_filter_input is not None:
+            if key in (10, 13):
+                PROC_TABLE.filter = self.proc_filter_input
+                self.proc_filter_input = None
+                COLLECTOR.trigger("procs")
+            elif key == 27:
+                self.proc_filter_input = None
+            elif key in (127, 8, curses.KEY_BACKSPACE):
+                self.proc_filter_input = self.proc_filter_input[:-1]
+            elif 32 <= key <= 126:
+                self.proc_filter_input += chr(key)
+            return
+        if key == curses.KEY_UP:
+            self.proc_sel -= 1
+        elif key == curses.KEY_DOWN:
+            self.proc_sel += 1
+        elif key == curses.KEY_PPAGE:
+            self.proc_sel -= 10
+        elif key == curses.KEY_NPAGE:
+            self.proc_sel += 10
+        elif key == ord("s"):
+            keys = ProcTable.SORT_KEYS
+            PROC_TABLE.sort = keys[(keys.index(PROC_TABLE.sort) + 1) % len(keys)]
+            COLLECTOR.trigger("procs")
+        elif key == ord("/"):
+            self.proc_filter_input = ""
+        elif key == 27:
+            PROC_TABLE.filter = ""
+            COLLECTOR.trigger("procs")
+        elif key == ord("K"):
+            procs = COLLECTOR.get()["procs"]
+            if 0 <= self.proc_sel < len(procs):
+                pid = procs[self.proc_sel]["pid"]
+                try:
+                    os.kill(pid, 15)
+                    EVENTS.add(f"SIGTERM sent to {pid}")
+                except Exception as e:
+                    EVENTS.add(f"Kill {pid} failed: {e}", "WARN")
+        self.proc_sel = max(0, self.proc_sel)
+
+    def draw_profile(self, y, x, h, w):
+        """F12 overlay: what drawing this screen and collecting its data costs."""
+        self.draw_box(y, x, h, w, "PROFILE (ms) F12", True)
+        PROFILER.sample()
+        cpu, rss, out = PROFILER.usage
+        usage = f"cpu {cpu:.1f}%  rss {format_size(rss)}  out {NET_SPEED.format_speed(out)}"
+        self.safe_addstr(y + 1, x + 2, usage, self.CYAN)
+        for i, row in enumerate(PROFILER.rows()[: h - 3]):
+            header = row.endswith(("p99", "err"))
+            self.safe_addstr(y + 2 + i, x + 2, row, self.WHITE if header else self.DIM)
+
+    def draw_status(self, y, x=0, h=1, w=0):
         theme_str = THEME_NAMES[self.theme_idx].upper()
         # Left side: Controls
-        ctrl = f" TAB:Switch │ ^T:Theme │ PgUp/Dn:Scroll │ Q:Exit "
+        if self.pty_focused():
+            ctrl = f" ^]:Release │ Keys go to: {self.terminal.session.cmd[:30]} "
+        else:
+            ctrl = f" TAB:Switch │ ^T:Theme │ ^P:Procs │ ^F:Find │ PgUp/Dn:Scroll │ Q:Exit "
         self.safe_addstr(y, 0, ctrl, self.INV)
 
         # Right side: Event Ticker
@@ -1293,8 +5074,103 @@ class SpectreTUI:
             latest = EVENTS.get_latest()
             self.safe_addstr(y, len(ctrl) + 1, f" ⚡ {latest:<{ticker_w}}", self.INV)
 
+    def panel_key(self, name):
+        """Everything a panel's content depends on besides its geometry."""
+        if name == "draw_logo":
+            return None
+        if name == "draw_stats":
+            keys = ("cpu", "mem", "disk", "load", "net_info", "ping", "net_speed", "history")
+            probed = ("net_info" in COLLECTOR.ready, "ping" in COLLECTOR.ready)
+            return self.spark_coarse, probed, tuple(COLLECTOR.get()[k] for k in keys)
+        if name == "draw_monitor":
+            keys = ("temp", "gpu", "bat", "sockets", "dio", "cpu", "history")
+            return self.spark_coarse, tuple(COLLECTOR.get()[k] for k in keys)
+        if name == "draw_time":
+            return int(time.time() // self.profile["clock"])
+        if name == "draw_profile":
+            return int(time.monotonic())
+        if name == "draw_filesystem":
+            fb = self.file_browser
+            fb.sync()
+            listing = fb.listing
+            return (
+                fb.path,
+                fb.selected,
+                listing,
+                listing.version,
+                listing.meta_version,
+                listing.loading,
+                listing.scanned,
+                self.fs_search,
+                self.active_pane == 0,
+            )
+        if name == "draw_terminal":
+            t = self.terminal
+            if t.session is not None:
+                return t.session.screen.version, t.session.cmd, self.active_pane == 1
+            find = self.term_find
+            return (
+                t.output.end,
+                t.output.first,
+                t.scroll,
+                t.input,
+                t.cursor,
+                t.prompt(),
+                t.rsearch and dict(t.rsearch),
+                find and (dict(find), t.search.progress(find["line"])),
+                self.active_pane == 1,
+            )
+        if name == "draw_preview":
+            filepath = self.file_browser.selected_file
+            pager = self.get_pager(filepath)
+            return filepath, pager.key(), self.pager_input, self.active_pane == 2
+        if name == "draw_procs":
+            return (
+                COLLECTOR.get()["procs"],
+                self.proc_sel,
+                self.proc_filter_input,
+                PROC_TABLE.sort,
+                PROC_TABLE.filter,
+                self.active_pane == 3,
+            )
+        if name == "draw_status":
+            session = self.terminal.session if self.pty_focused() else None
+            return session and session.cmd, EVENTS.get_latest()
+        return time.time()  # Unknown panel: always redraw
+
+    def render(self, draw_fn, y, x, h, w):
+        """Draw a panel into its own window, only if its content key changed.
+
+        Windows are only marked for output (noutrefresh); draw() flushes all
+        of them with a single doupdate().
+        """
+        name = draw_fn.__name__
+        panel = self.panels.get(name)
+        if panel is None or panel[1] != (y, x, h, w):
+            try:
+                win = curses.newwin(h, w, y, x)
+            except curses.error:
+                return
+            win.bkgd(" ", curses.color_pair(1))
+            panel = self.panels[name] = [win, (y, x, h, w), None]
+        key = (self.generation, self.panel_key(name))
+        if panel[2] == key:
+            return
+        panel[2] = key
+        win = panel[0]
+        win.erase()
+        self.canvas = (win, y, x, h, w)
+        started = time.perf_counter()
+        try:
+            draw_fn(y, x, h, w)
+        finally:
+            self.canvas = (self.stdscr, 0, 0, self.height, self.width)
+        win.noutrefresh()
+        PROFILER.record(name, time.perf_counter() - started)
+        self.repaints += 1
+
     def draw(self):
-        self.stdscr.erase()
+        started = time.perf_counter()
         h, w = self.height, self.width
 
         row1_h = 14
@@ -1309,101 +5185,399 @@ class SpectreTUI:
         remaining = w - logo_w
 
         # Row 1 Rendering with responsive panels
-        self.draw_logo(0, 0, row1_h, logo_w)
+        layout = [(self.draw_logo, 0, 0, row1_h, logo_w)]
 
         if remaining > 60:
             # Show Stats, Monitor, Time
             pw = remaining // 3
-            self.draw_stats(0, logo_w, row1_h, pw)
-            self.draw_monitor(0, logo_w + pw, row1_h, pw)
-            self.draw_time(0, logo_w + pw * 2, row1_h, w - (logo_w + pw * 2))
+            layout.append((self.draw_stats, 0, logo_w, row1_h, pw))
+            layout.append((self.draw_monitor, 0, logo_w + pw, row1_h, pw))
+            time_x = logo_w + pw * 2
+            layout.append((self.draw_time, 0, time_x, row1_h, w - time_x))
         elif remaining > 40:
             # Show Stats and Time
             pw = remaining // 2
-            self.draw_stats(0, logo_w, row1_h, pw)
-            self.draw_time(0, logo_w + pw, row1_h, w - (logo_w + pw))
+            layout.append((self.draw_stats, 0, logo_w, row1_h, pw))
+            layout.append((self.draw_time, 0, logo_w + pw, row1_h, w - (logo_w + pw)))
         else:
             # Show only Time
-            self.draw_time(0, logo_w, row1_h, remaining)
+            layout.append((self.draw_time, 0, logo_w, row1_h, remaining))
 
-        # Row 2: Filesystem | Terminal | Preview (if file selected)
+        # Row 2: Filesystem | Terminal | Preview / Processes (stacked if both)
+        right = []
         if self.file_browser.selected_file:
+            right.append(self.draw_preview)
+        elif self.pager is not None:
+            self.pager.close()
+            self.pager = None
+        if self.show_procs:
+            right.append(self.draw_procs)
+        if right:
             fs_w = w // 4
-            preview_w = w // 4
-            term_w = w - fs_w - preview_w
-            self.draw_filesystem(row1_h, 0, row2_h, fs_w)
-            self.draw_terminal(row1_h, fs_w, row2_h, term_w)
-            self.draw_preview(row1_h, fs_w + term_w, row2_h, preview_w)
+            right_w = w // 4
+            term_w = w - fs_w - right_w
+            layout.append((self.draw_filesystem, row1_h, 0, row2_h, fs_w))
+            layout.append((self.draw_terminal, row1_h, fs_w, row2_h, term_w))
+            ry = row1_h
+            for i, draw_fn in enumerate(right):
+                rh = row2_h // len(right) if i < len(right) - 1 else row1_h + row2_h - ry
+                layout.append((draw_fn, ry, fs_w + term_w, rh, right_w))
+                ry += rh
         else:
             fs_w = w // 3
             term_w = w - fs_w
-            self.draw_filesystem(row1_h, 0, row2_h, fs_w)
-            self.draw_terminal(row1_h, fs_w, row2_h, term_w)
-
-        self.draw_status(h - 1)
-        self.stdscr.refresh()
+            layout.append((self.draw_filesystem, row1_h, 0, row2_h, fs_w))
+            layout.append((self.draw_terminal, row1_h, fs_w, row2_h, term_w))
+        layout.append((self.draw_status, h - 1, 0, 1, w))
+        if self.show_profile:
+            # Floats over the right of row 2, so it is rendered last
+            panels = sum(name.startswith("draw_") for name in PROFILER.series)
+            ow = min(w, 47)
+            oh = min(row2_h, 7 + panels + len(COLLECTOR.tasks))
+            layout.append((self.draw_profile, row1_h, w - ow, oh, ow))
+
+        shape = [(fn.__name__, geom) for fn, *geom in layout]
+        if shape != self.layout:
+            # Panels appeared, vanished or moved: start from a clean screen
+            self.layout = shape
+            self.generation += 1
+            names = {name for name, _ in shape}
+            self.panels = {k: v for k, v in self.panels.items() if k in names}
+            self.stdscr.clear()
+            self.stdscr.noutrefresh()
+        repaints = self.repaints
+        for draw_fn, py, px, ph, pw in layout:
+            self.render(draw_fn, py, px, ph, pw)
+        overlay = self.panels.get("draw_profile")
+        if self.show_profile and overlay and self.repaints != repaints:
+            # A panel underneath was redrawn over it; put it back on top
+            overlay[0].touchwin()
+            overlay[0].noutrefresh()
+        curses.doupdate()
+        PROFILER.record("frame", time.perf_counter() - started)
+
+    def tab_completes(self):
+        """TAB edits the terminal line when there is one; otherwise it switches panes."""
+        if self.active_pane != 1:
+            return False
+        if self.term_find is not None:
+            return self.term_find["editing"]
+        return bool(self.terminal.input.strip()) or self.terminal.rsearch is not None
 
     def handle_key(self, key):
-        if (key == ord("q") or key == ord("Q")) and self.active_pane != 1:
+        if self.pty_focused() and key != curses.KEY_RESIZE:
+            if key == 29:  # Ctrl+]
+                self.active_pane = 0
+            else:
+                self.terminal.session.send_key(key)
+            return
+        if self.active_pane == 2 and not self.file_browser.selected_file:
+            self.active_pane = 0
+        typing = (
+            self.active_pane == 1
+            or self.proc_filter_input is not None
+            or self.fs_search is not None
+        )
+        if (key == ord("q") or key == ord("Q")) and not typing:
             self.running = False
         elif key == 20:  # Ctrl+T
             self.cycle_theme()
-        elif key == 9:  # TAB
-            self.active_pane = 1 - self.active_pane
+        elif key == 16:  # Ctrl+P
+            self.toggle_procs()
+        elif key == curses.KEY_F2:
+            self.spark_coarse = not self.spark_coarse
+            EVENTS.add(f"Graphs: 1 {'minute' if self.spark_coarse else 'second'} per cell")
+        elif key == curses.KEY_F12:
+            self.show_profile = not self.show_profile
+        elif key == curses.KEY_BTAB or (key == 9 and not self.tab_completes()):
+            panes = [0, 1]
+            if self.file_browser.selected_file:
+                panes.append(2)
+            if self.show_procs:
+                panes.append(3)
+            pos = panes.index(self.active_pane) if self.active_pane in panes else 0
+            step = -1 if key == curses.KEY_BTAB else 1
+            self.active_pane = panes[(pos + step) % len(panes)]
         elif key == curses.KEY_RESIZE:
             self.height, self.width = self.stdscr.getmaxyx()
         elif self.active_pane == 0:
-            if key == curses.KEY_UP:
-                self.file_browser.up()
-            elif key == curses.KEY_DOWN:
-                self.file_browser.down()
-            elif key == 10:
-                self.file_browser.enter()
+            self.handle_fs_key(key)
         elif self.active_pane == 1:
-            if key == curses.KEY_PPAGE:
+            if self.term_find is not None and self.handle_find_key(key):
+                pass
+            elif key == 6:  # Ctrl+F
+                self.open_find()
+            elif key == curses.KEY_PPAGE:
                 self.terminal.scroll += 10
             elif key == curses.KEY_NPAGE:
                 self.terminal.scroll -= 10
             else:
                 self.terminal.type_key(key)
+        elif self.active_pane == 2:
+            self.handle_preview_key(key)
+        elif self.active_pane == 3:
+            self.handle_procs_key(key)
+
+    def handle_mouse(self, state, my, mx):
+        """Route a click, wheel step or (coalesced) motion to the panel under it."""
+        for name, (_, (y, x, h, w), _) in self.panels.items():
+            if name in self.PANES and y <= my < y + h and x <= mx < x + w:
+                break
+        else:
+            return
+        session = self.terminal.session
+        if name == "draw_terminal" and self.pty_focused() and session.screen.mouse:
+            col = max(0, min(mx - x - 1, w - 3))
+            row = max(0, min(my - y - 1, h - 3))
+            if state & curses.REPORT_MOUSE_POSITION:
+                session.send_mouse(col, row, self.mouse_held, motion=True)
+            elif state & (curses.BUTTON4_PRESSED | self.wheel_down):
+                session.send_mouse(col, row, 64 if state & curses.BUTTON4_PRESSED else 65)
+            for button, (pressed, released, clicked, double) in enumerate(self.buttons):
+                if state & pressed:
+                    self.mouse_held = button
+                    session.send_mouse(col, row, button)
+                elif state & released:
+                    self.mouse_held = 3
+                    session.send_mouse(col, row, button, release=True)
+                else:
+                    # ncurses folds press/release pairs read in one go into clicks
+                    for _ in range(2 if state & double else 1 if state & clicked else 0):
+                        session.send_mouse(col, row, button)
+                        session.send_mouse(col, row, button, release=True)
+            return
 
-        elif key == curses.KEY_MOUSE:
-            try:
-                _, mx, my, _, state = curses.getmouse()
-                if state & curses.BUTTON1_CLICKED:
-                    # Detect panel click
-                    row1_h = 14
-                    if my >= row1_h:
-                        if mx < self.width // 3:
-                            self.active_pane = 0
-                        else:
-                            self.active_pane = 1
-            except:
-                pass
+        wheel = 0
+        if state & curses.BUTTON4_PRESSED:
+            wheel = -3
+        elif state & self.wheel_down:
+            wheel = 3
+        if wheel:
+            if name == "draw_filesystem":
+                self.file_browser.jump(self.file_browser.selected + wheel)
+            elif name == "draw_terminal" and session is None:
+                self.terminal.scroll = max(0, self.terminal.scroll - wheel)
+            elif name == "draw_preview" and self.file_browser.selected_file:
+                self.get_pager(self.file_browser.selected_file).scroll(wheel)
+            elif name == "draw_procs":
+                self.proc_sel = max(0, self.proc_sel + wheel)
+            return
+        double = state & (curses.BUTTON1_DOUBLE_CLICKED | curses.BUTTON1_TRIPLE_CLICKED)
+        if not double and not state & (curses.BUTTON1_PRESSED | curses.BUTTON1_CLICKED):
+            return
+
+        self.active_pane = self.PANES[name]
+        now = time.monotonic()
+        if name == "draw_filesystem":
+            fb = self.file_browser
+            row = my - y - 2
+            if 0 <= row < h - 4 and fb.scroll + row < fb.count():
+                idx = fb.scroll + row
+                last, last_idx = self.last_click
+                self.last_click = (now, idx)
+                fb.jump(idx)
+                if double or (last_idx == idx and now - last < self.DOUBLE_CLICK):
+                    self.last_click = (0, None)
+                    fb.enter()
+        elif name == "draw_procs":
+            row = my - y - 3
+            if 0 <= row < h - 4:
+                self.proc_sel = self.proc_scroll + row
+
+    def track_motion(self):
+        """Enable any/button-motion reports only while a focused pty app wants them."""
+        session = self.terminal.session
+        want = 0
+        if self.pty_focused() and session.screen.mouse in (1002, 1003):
+            want = session.screen.mouse
+        if want == self.motion:
+            return
+        self.motion = want
+        mask = curses.ALL_MOUSE_EVENTS
+        if want:
+            mask |= curses.REPORT_MOUSE_POSITION
+        curses.mousemask(mask)
+        # Switching to 1000 (clicks only) rather than resetting keeps tracking on
+        print(f"\033[?{want or 1000}h", end="", flush=True)
+
+    def on_interrupt(self, signum, frame):
+        """Ctrl+C goes to the foreground job; otherwise it clears or exits."""
+        if self.pty_focused():
+            self.terminal.session.write(b"\x03")
+            return
+        if self.terminal.interrupt():
+            return
+        if self.active_pane == 1 and (self.terminal.input or self.terminal.rsearch):
+            self.terminal.rsearch = None
+            self.terminal.hist_pos = None
+            self.terminal.input = ""
+            self.terminal.cursor = 0
+        else:
+            self.running = False
+
+    def on_suspend(self, signum, frame):
+        if self.pty_focused():
+            self.terminal.session.write(b"\x1a")
+            return
+        self.terminal.suspend()
+
+    def on_winch(self, signum, frame):
+        self.resized = True
+
+    def read_key(self):
+        """Next key, or None once input is drained; focus reports are consumed."""
+        key = self.stdscr.getch()
+        if key == -1:
+            return None
+        if key == 27:
+            seq = [self.stdscr.getch()]
+            if seq[0] == 91:  # [
+                seq.append(self.stdscr.getch())
+                if seq[1] in (73, 79):  # I / O
+                    self.focused = seq[1] == 73
+                    return self.read_key()
+            for k in reversed(seq):
+                if k != -1:
+                    curses.ungetch(k)
+        self.last_input = time.monotonic()
+        return key
+
+    def pace(self):
+        """Stretch collector intervals while nobody is looking."""
+        if not self.focused:
+            state = "unfocused"
+        elif time.monotonic() - self.last_input > self.profile["idle_after"]:
+            state = "idle"
+        else:
+            state = "active"
+        COLLECTOR.set_scale(self.profile[state])
+
+    def next_timer(self):
+        """Seconds until something on screen changes without any input."""
+        now = time.time()
+        clock = self.profile["clock"]
+        timeout = min(clock - now % clock, EVENTS.next_flavor - now)  # Clock, ticker
+        if self.focused and COLLECTOR.scale == self.profile["active"]:
+            idle_at = self.last_input + self.profile["idle_after"]
+            timeout = min(timeout, idle_at - time.monotonic())
+        if self.pager is not None and self.file_browser.selected_file:
+            due = self.pager.deadline()
+            if due is not None:
+                timeout = min(timeout, due - time.monotonic())
+        if self.file_browser.listing.loading:
+            timeout = min(timeout, 0.1)  # Scan progress in the panel title
+        if self.show_profile:
+            timeout = min(timeout, 1 - time.monotonic() % 1)  # Overlay figures
+        if not self.terminal.job_output.empty():
+            timeout = 0  # pump() stopped at its per-frame limit
+        return max(0.0, timeout)
+
+    def wait(self, timeout):
+        """Sleep until a key, pty output, a WAKER poke or `timeout` seconds."""
+        if IS_WINDOWS:
+            time.sleep(min(timeout, 0.01))  # select() can't watch the console
+            return
+        fds = [sys.stdin.fileno(), WAKER.fileno()]
+        session = self.terminal.session
+        if session is not None and session.alive:
+            fds.append(session.fd)
+        try:
+            select.select(fds, [], [], timeout)
+        except (OSError, ValueError):
+            pass
+        WAKER.drain()
 
     def run(self):
+        signal.signal(signal.SIGINT, self.on_interrupt)
+        if hasattr(signal, "SIGTSTP"):
+            signal.signal(signal.SIGTSTP, self.on_suspend)
+        if not IS_WINDOWS:
+            # Resizes and exiting/stopped pty children must wake select();
+            # the handlers themselves only set flags
+            signal.signal(signal.SIGWINCH, self.on_winch)
+            signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+            signal.set_wakeup_fd(WAKER.w, warn_on_full_buffer=False)
         last_draw = 0
         while self.running:
-            try:
-                key = self.stdscr.getch()
-                if key != -1:
-                    self.handle_key(key)
-            except:
-                pass
+            if self.resized:
+                # Our SIGWINCH handler replaced curses' own, so resize here
+                self.resized = False
+                # Ask the tty: shutil prefers exported COLUMNS/LINES, which go stale
+                try:
+                    size = os.get_terminal_size(sys.__stdout__.fileno())
+                except (AttributeError, OSError, ValueError):
+                    size = shutil.get_terminal_size()
+                curses.resizeterm(size.lines, size.columns)
+            # Drain all pending input; mouse motion collapses to its latest report
+            motion = None
+            while True:
+                try:
+                    key = self.read_key()
+                except:
+                    break
+                if key is None:
+                    break
+                if self.input_at is None:
+                    self.input_at = time.perf_counter()
+                try:
+                    if key != curses.KEY_MOUSE:
+                        self.handle_key(key)
+                        continue
+                    _, mx, my, _, state = curses.getmouse()
+                    if state & curses.REPORT_MOUSE_POSITION:
+                        motion = (state, my, mx)
+                        continue
+                    if motion is not None:
+                        # The drag so far must land before the press/release
+                        pending, motion = motion, None
+                        self.handle_mouse(*pending)
+                    self.handle_mouse(state, my, mx)
+                except:
+                    pass
+            if motion is not None:
+                try:
+                    self.handle_mouse(*motion)
+                except:
+                    pass
+            self.pace()
 
-            # Update background events
+            # Update background events and stream job / pty output
             EVENTS.update()
+            self.terminal.pump()
+            if self.pty_focused() != self.raw_keys:
+                # Raw mode while a pty has focus so ^C, ^Z, ^\ and ^S reach it
+                self.raw_keys = not self.raw_keys
+                if self.raw_keys:
+                    curses.raw()
+                else:
+                    curses.noraw()
+                    curses.cbreak()
+            self.track_motion()
 
-            now = time.time()
-            if now - last_draw >= 0.05:
+            # At most one frame per "frame"; otherwise sleep until there is work
+            now = time.monotonic()
+            timeout = last_draw + self.profile["frame"] - now
+            if timeout <= 0:
                 last_draw = now
                 self.draw()
+                if not STARTUP.painted:
+                    STARTUP.mark("first frame")
+                if self.input_at is not None:
+                    PROFILER.record("input", time.perf_counter() - self.input_at)
+                    self.input_at = None
                 # Check for exit flag
                 if self.terminal.should_exit:
                     self.running = False
-            else:
-                time.sleep(0.01)
-
+                    break
+                timeout = self.next_timer()
+            self.wait(timeout)
+
+        print("\033[?1004l", end="", flush=True)
+        COLLECTOR.stop()
+        if self.terminal.session is not None:
+            self.terminal.session.close()
+        for job in list(self.terminal.jobs.values()):
+            job.signal(signal.SIGHUP if hasattr(signal, "SIGHUP") else signal.SIGTERM)
         # Save state on exit
         save_config(self.theme_idx, self.file_browser.path)
 
@@ -1448,18 +5622,309 @@ def loading(stdscr):
         time.sleep(0.15)
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# HEADLESS EXPORTER
+# ═══════════════════════════════════════════════════════════════════════════════
+class Exporter:
+    """Prometheus text and JSON views of the collector snapshot.
+
+    Each format is serialized at most once per snapshot version and the bytes
+    are shared by every request until the collector publishes again, so
+    scrapes never run a collector and cost the same at any scrape rate.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.bodies = {}
+
+    def body(self, fmt):
+        with self.lock:
+            version = COLLECTOR.version
+            if version != self.version:
+                self.version, self.bodies = version, {}
+            if fmt not in self.bodies:
+                snap = COLLECTOR.get()
+                render = self.render_metrics if fmt == "metrics" else self.render_json
+                self.bodies[fmt] = render(snap).encode()
+            return self.bodies[fmt]
+
+    def render_json(self, snap):
+        doc = {"time": time.time(), "host": HOST, "metrics": snap}
+        return json.dumps(doc, default=dict, separators=(",", ":"))
+
+    @staticmethod
+    def escape(value):
+        """A label value as the text exposition format quotes it."""
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    def render_metrics(self, snap):
+        lines = []
+
+        def emit(name, help, samples, kind="gauge"):
+            rows = []
+            for labels, value in samples:
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    continue  # "N/A" etc.: omit the sample
+                label = ",".join(f'{k}="{self.escape(v)}"' for k, v in labels.items())
+                series = f"spectral_{name}{{{label}}}" if label else f"spectral_{name}"
+                rows.append(f"{series} {value!r}")
+            if rows:
+                lines.append(f"# HELP spectral_{name} {help}")
+                lines.append(f"# TYPE spectral_{name} {kind}")
+                lines.extend(rows)
+
+        cpu, socks = snap["cpu"], snap["sockets"]
+        emit("info", "Host running this exporter.", [({"host": HOST}, 1)])
+        emit("cpu_usage_percent", "Total CPU busy time.", [({}, cpu["total"])])
+        emit(
+            "cpu_state_percent",
+            "CPU time by state.",
+            [({"state": k}, v) for k, v in cpu["states"].items()],
+        )
+        emit(
+            "cpu_core_usage_percent",
+            "Busy time per core.",
+            [({"core": str(i)}, v) for i, v in enumerate(cpu["cores"])],
+        )
+        emit("memory_usage_percent", "Memory in use.", [({}, snap["mem"][1])])
+        emit("disk_usage_percent", "Root filesystem in use.", [({}, snap["disk"][1])])
+        emit("load1", "One-minute load average.", [({}, snap["load"])])
+        down, up = NET_SPEED.rates
+        emit("network_receive_bytes_per_second", "Inbound traffic.", [({}, down)])
+        emit("network_transmit_bytes_per_second", "Outbound traffic.", [({}, up)])
+        ping = snap["ping"].rstrip("ms")
+        emit("ping_milliseconds", "Ping round trip.", [({}, ping)])
+        emit("temperature_celsius", "CPU temperature.", [({}, snap["temp"].rstrip("°C"))])
+        emit(
+            "sockets_established",
+            "Established TCP connections.",
+            [({}, socks["established"])],
+        )
+        emit(
+            "sockets",
+            "TCP sockets by state.",
+            [({"state": k}, v) for k, v in socks["states"].items()],
+        )
+        emit("listening_ports", "Listening TCP ports.", [({}, len(socks["listen"]))])
+        emit(
+            "snapshot_version_total",
+            "Collector updates so far.",
+            [({}, COLLECTOR.version)],
+            "counter",
+        )
+        return "\n".join(lines) + "\n"
+
+
+def run_headless(listen):
+    """Serve /metrics and /json from the collectors, without curses."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    host, _, port = listen.rpartition(":")
+    host = host.strip("[]") or "127.0.0.1"
+    exporter = Exporter()
+    routes = {
+        "/metrics": ("metrics", "text/plain; version=0.0.4; charset=utf-8"),
+        "/json": ("json", "application/json"),
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            route = routes.get(self.path.split("?", 1)[0])
+            if route is None:
+                self.send_error(404)
+                return
+            body = exporter.body(route[0])
+            self.send_response(200)
+            self.send_header("Content-Type", route[1])
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        address_family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        daemon_threads = True
+
+    server = Server((host, int(port)), Handler)
+    COLLECTOR.start()
+    print(f"SPECTRAL exporter listening on {listen} (/metrics, /json)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        COLLECTOR.stop()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SNAPSHOT CLI
+# ═══════════════════════════════════════════════════════════════════════════════
+SNAPSHOT_SKIP = ("ping",)  # Waits on the network: opt-in
+RATE_TASKS = ("cpu", "net_speed", "procs")  # Need a previous reading
+SAMPLE_WINDOW = 0.5  # Between --once rate readings (CpuSampler caches for 0.5s)
+
+
+def snapshot_tasks(names=None):
+    """Collector tasks to sample: `names` (comma-separated) or the defaults."""
+    if not names:
+        return [name for name in COLLECTOR.tasks if name not in SNAPSHOT_SKIP]
+    wanted = [name.strip() for name in names.split(",") if name.strip()]
+    unknown = [name for name in wanted if name not in COLLECTOR.tasks]
+    if unknown:
+        raise ValueError(f"unknown metric(s): {', '.join(unknown)}")
+    return wanted
+
+
+def take_snapshot(tasks):
+    """Run the given collector tasks inline (no threads) and return a document."""
+    for name in tasks:
+        COLLECTOR.run_task(name)
+    snap = COLLECTOR.get()
+    metrics = {name: snap[name] for name in tasks}
+    return {"time": time.time(), "host": HOST, "metrics": metrics}
+
+
+def run_snapshots(once, as_json, interval, names=None):
+    """--once / --stream: print snapshots to stdout without any UI."""
+    tasks = snapshot_tasks(names)
+    rates = [name for name in tasks if name in RATE_TASKS]
+    for name in rates:
+        COLLECTOR.run_task(name)
+    # Each tick must read fresh counters rather than the cached sample
+    CPU_SAMPLER.max_age = min(CPU_SAMPLER.max_age, interval / 2)
+    out = sys.stdout
+    try:
+        if once:
+            if rates:
+                time.sleep(SAMPLE_WINDOW)
+            doc = take_snapshot(tasks)
+            if as_json:
+                out.write(json.dumps(doc, default=dict) + "\n")
+            else:
+                for name, value in doc["metrics"].items():
+                    out.write(f"{name}: {json.dumps(value, default=dict)}\n")
+            return
+        tick = time.monotonic()
+        while True:
+            tick += interval
+            time.sleep(max(0.0, tick - time.monotonic()))
+            tick = max(tick, time.monotonic() - interval)  # Don't burst after a stall
+            doc = take_snapshot(tasks)
+            out.write(json.dumps(doc, default=dict, separators=(",", ":")) + "\n")
+            out.flush()
+    except (BrokenPipeError, KeyboardInterrupt):
+        pass
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # MAIN
 # ═══════════════════════════════════════════════════════════════════════════════
-def main(stdscr):
-    loading(stdscr)
-    SpectreTUI(stdscr).run()
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="spectral", description="SPECTRAL terminal dashboard"
+    )
+    parser.add_argument(
+        "--low-power",
+        action="store_true",
+        help="refresh less often (overrides the config file's profile)",
+    )
+    parser.add_argument(
+        "--splash",
+        action="store_true",
+        help='show the loading animation (or set "splash": true in the config)',
+    )
+    parser.add_argument(
+        "--startup-times",
+        action="store_true",
+        help="print how long each start-up phase took on exit",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="write draw, input and collector timings to FILE on exit",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="no UI: serve metrics over HTTP (see --listen)",
+    )
+    parser.add_argument(
+        "--listen",
+        default="127.0.0.1:9184",
+        metavar="HOST:PORT",
+        help="address for --headless (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="print one snapshot and exit"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="print a JSON snapshot every --interval seconds (NDJSON)",
+    )
+    parser.add_argument("--json", action="store_true", help="JSON output for --once")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="--stream period (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="NAMES",
+        help="comma-separated metrics for --once/--stream (default: all but "
+        + ", ".join(SNAPSHOT_SKIP)
+        + ")",
+    )
+    args = parser.parse_args(argv)
+    if args.interval <= 0:
+        parser.error("--interval must be positive")
+    if ":" not in args.listen or not args.listen.rpartition(":")[2].isdigit():
+        parser.error(f"--listen expects HOST:PORT, got {args.listen!r}")
+    return args
+
+
+def main(stdscr, args):
+    STARTUP.mark("curses")
+    if args.splash or load_config().get("splash", False):
+        loading(stdscr)
+        STARTUP.mark("splash")
+    SpectreTUI(stdscr, low_power=args.low_power).run()
 
 
 if __name__ == "__main__":
+    STARTUP.mark("module setup")
+    args = parse_args()
+    STARTUP.mark("arguments")
+    if args.headless:
+        run_headless(args.listen)
+        sys.exit(0)
+    if args.once or args.stream:
+        try:
+            run_snapshots(args.once, args.json, args.interval, args.metrics)
+        except ValueError as e:
+            sys.exit(f"spectral: {e}")
+        sys.exit(0)
     try:
-        curses.wrapper(main)
+        curses.wrapper(main, args)
     except KeyboardInterrupt:
         pass
     finally:
         print("\n\033[1;32m>>> SPECTRAL terminated. <<<\033[0m\n")
+        if args.startup_times:
+            print(STARTUP.report(), file=sys.stderr)
+        if args.profile:
+            try:
+                with open(args.profile, "w") as f:
+                    f.write(PROFILER.report() + "\n" + STARTUP.report() + "\n")
+            except OSError as e:
+                print(f"spectral: cannot write {args.profile}: {e}", file=sys.stderr)
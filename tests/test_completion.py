@@ -0,0 +1,29 @@
+import time
+
+import spectral
+
+
+def complete(completer, line, cwd):
+    # Directory listings are built in the background; retry until ready
+    deadline = time.monotonic() + 2
+    while True:
+        _, _, found = completer.complete(line, len(line), cwd)
+        if found or time.monotonic() > deadline:
+            return found
+        time.sleep(0.01)
+
+
+def test_cd_with_slash_offers_only_directories(tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "dump.txt").write_text("x")
+    base = str(tmp_path)
+    found = complete(spectral.Completer(), f"cd {base}/d", "/")
+    assert found == [f"{base}/data/"]
+
+
+def test_other_commands_offer_files_too(tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "dump.txt").write_text("x")
+    base = str(tmp_path)
+    found = complete(spectral.Completer(), f"cat {base}/d", "/")
+    assert found == [f"{base}/data/", f"{base}/dump.txt"]
@@ -0,0 +1,15 @@
+import time
+
+import spectral
+
+
+def test_stat_is_filled_in_the_background(tmp_path):
+    (tmp_path / "a.txt").write_text("hello")
+    listing = spectral.DirListing(str(tmp_path)).load()
+    assert listing.stat("a.txt") is None  # Never stats on the caller's thread
+    deadline = time.monotonic() + 2
+    while listing.stat("a.txt") is None:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert listing.stat("a.txt")[0] == 5
+    assert listing.meta_version == 1
@@ -0,0 +1,37 @@
+import os
+import time
+
+import spectral
+
+
+def wait_for(cond):
+    deadline = time.monotonic() + 5
+    while not cond():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_add_queues_until_loaded_and_keeps_order(tmp_path):
+    path = tmp_path / "history"
+    path.write_text("".join(f"cmd {i}\n" for i in range(50000)))
+    history = spectral.History(str(path), cap=100000)
+    history.add("newest")  # Starts the load; must not parse the file here
+    wait_for(lambda: history.loaded)
+    assert history.older() == (50000, "newest")
+    assert path.read_text().splitlines()[-1] == "newest"
+
+
+def test_overflow_compacts_in_background(tmp_path):
+    path = tmp_path / "history"
+    history = spectral.History(str(path), cap=100)
+    history.preload()
+    wait_for(lambda: history.loaded)
+    for i in range(126):
+        history.add(f"cmd {i}")
+    history.add("after")  # Queued while the rewrite runs, then saved
+    wait_for(lambda: not history.rewriting and not history.pending)
+    lines = path.read_text().splitlines()
+    assert lines[-1] == "after"
+    assert len(lines) <= 101
+    assert history.older()[1] == "after"
+    assert oct(os.stat(path).st_mode & 0o777) == "0o600"
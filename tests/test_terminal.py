@@ -0,0 +1,36 @@
+import pytest
+
+import spectral
+
+
+@pytest.fixture
+def terminal(tmp_path, monkeypatch):
+    monkeypatch.setattr(spectral, "HISTORY_FILE", str(tmp_path / "history"))
+    term = spectral.Terminal(scrollback=1000, history=100)
+    term.cwd = str(tmp_path)
+    return term
+
+
+class FinishedSession:
+    def __init__(self, cmd):
+        self.cmd = cmd
+        self.alive = False
+        self.returncode = 0
+        self.screen = spectral.VTScreen(4, 20)
+
+    def pump(self):
+        return False
+
+
+def test_bare_bang_is_rejected(terminal):
+    terminal.execute("!")
+    assert terminal.session is None
+    assert terminal.output[-1].startswith("[Usage: !<command>")
+    assert terminal.input == ""
+
+
+def test_session_without_command_exits_cleanly(terminal):
+    terminal.session = FinishedSession("")
+    assert terminal.pump_session()
+    assert terminal.session is None
+    assert terminal.output[-1] == "[Exited sh]"